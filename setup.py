@@ -22,5 +22,6 @@ setup(
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.10',
-    install_requires=['requests==2.31.0']
+    install_requires=['requests==2.31.0'],
+    extras_require={'async': ['httpx'], 'fast': ['orjson'], 'numpy': ['numpy']}
 )
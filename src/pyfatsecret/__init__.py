@@ -1 +1,14 @@
 from .fatsecret import Fatsecret
+from .token_manager import TokenManager
+from .transport import Transport, ConnectFailedError
+from .async_fatsecret import AsyncFatsecret
+from .token_store import TokenStore, FileTokenStore, SQLiteTokenStore
+from .rate_limiter import RateLimiter, RateLimitExceeded
+from .errors import (FatsecretError, FatsecretServerError, FatsecretAuthError, FatsecretInvalidTokenError,
+                     FatsecretRateLimitError, FatsecretParameterError, FatsecretApplicationError)
+from .retry import RetryPolicy
+from .batch import Batch, BatchResult
+from .cache import ResponseCache, MemoryCache, TieredCache
+from .sqlite_cache import SQLiteDetailCache
+from .barcodes import BarcodeResolver, normalize_barcode
+from .models import Food, Serving, Recipe, Ingredient, FoodEntry
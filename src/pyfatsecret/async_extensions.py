@@ -0,0 +1,200 @@
+"""
+Module `async_extensions.py` contains the async variants of the hand-written methods in
+`extensions.py`. The async classes inherit them before the generated classes, so that they
+replace the blocking methods, which need the client's executor.
+"""
+import asyncio
+from pyfatsecret.batch import BatchResult
+from pyfatsecret.extensions import MultiLocaleSearchResult, get_locales, get_ranking_policy, get_search_foods, \
+    merge_locale_results
+from pyfatsecret.utils import as_list
+
+
+class AsyncClientExtensions:
+    """
+    Helpers shared by the async extensions. They use the methods of `AsyncFatsecretBase`.
+    """
+
+    async def _iterate_pages(self, fetch_page, get_page_data, get_items, max_results: int, prefetch: int = 0,
+                             max_items: int = None):
+        """
+        Yields the items of all pages of a paginated search.
+
+        Parameters:
+            fetch_page (Callable[[int], Awaitable[dict]]): Fetches the page with the given zero-based number.
+            get_page_data (Callable[[dict], dict]): Returns the part of a response that holds
+                'total_results' and the items.
+            get_items (Callable[[dict], Any]): Returns the items of the page data.
+            max_results (int): Number of items per page.
+            prefetch (int, optional): Number of following pages to fetch concurrently while the
+                items of the current page are consumed.
+            max_items (int, optional): Stop after this many items.
+        """
+        first_page = await fetch_page(0)
+        total = int(get_page_data(first_page).get('total_results', 0))
+        if max_items is not None:
+            total = min(total, max_items)
+        page_count = -(-total // max_results)
+
+        pending = {}
+        next_page_to_submit = 1
+        count = 0
+        try:
+            for page_number in range(page_count):
+                next_page_to_submit = max(next_page_to_submit, page_number + 1)
+                while next_page_to_submit < min(page_count, page_number + prefetch + 1):
+                    pending[next_page_to_submit] = asyncio.ensure_future(
+                        fetch_page(next_page_to_submit))
+                    next_page_to_submit += 1
+
+                if page_number == 0:
+                    page = first_page
+                elif page_number in pending:
+                    page = await pending.pop(page_number)
+                else:
+                    page = await fetch_page(page_number)
+
+                items = as_list(get_items(get_page_data(page)))
+                if not items:
+                    return
+                for item in items:
+                    if count >= total:
+                        return
+                    yield item
+                    count += 1
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+
+class AsyncFoodsExtensions(AsyncClientExtensions):
+    """
+    Hand-written methods of `AsyncFoods`.
+    """
+
+    def iter_foods_search_v3(self, search_expression=None, max_results=50, prefetch=0, max_items=None,
+                             **kwargs):
+        """
+        Iterates lazily over all foods found by `foods_search_v3`, fetching the pages as needed.
+
+        Only the current page and the prefetched pages are held in memory.
+
+        Args:
+            search_expression (String, optional): Search expression to match on food names
+            max_results (Int, optional): Number of foods per page, at most 50
+            prefetch (Int, optional): Number of following pages to fetch concurrently
+            max_items (Int, optional): Maximum number of foods to yield
+            **kwargs: Other parameters of `foods_search_v3`, e.g. region or language
+
+        Yields:
+            dict: The foods, in the order of the search results, to be consumed with `async for`.
+        """
+        return self._iterate_pages(
+            lambda page_number: self.foods_search_v3(search_expression=search_expression,
+                                                     page_number=page_number, max_results=max_results, **kwargs),
+            lambda response: response.get('foods_search') or {},
+            lambda page_data: (page_data.get('results') or {}).get('food'),
+            max_results, prefetch, max_items)
+
+    async def foods_search_locales(self, search_expression, locales, deadline=None, ranking='interleave',
+                                   max_results=None, **kwargs) -> MultiLocaleSearchResult:
+        """
+        Searches foods in several locales concurrently with `foods_search_v3` and merges the results.
+
+        Foods are deduplicated by food_id. If some locales don't answer before the deadline, their
+        searches are cancelled and the results of the others are returned.
+
+        Args:
+            search_expression (String): Search expression to match on food names
+            locales (Iterable): Regions like "FR" or (region, language) pairs like ("FR", "fr")
+            deadline (Float, optional): Seconds to wait for the searches, None waits for all
+            ranking (String or Callable, optional): "interleave", "locale_order", "best_rank" or a
+                function that gets the foods per locale and returns them in the merged order
+            max_results (Int, optional): Maximum number of results per locale, at most 50
+            **kwargs: Other parameters of `foods_search_v3`
+
+        Raises:
+            ValueError: when the ranking is not a known policy or a function.
+
+        Returns:
+            MultiLocaleSearchResult: The merged foods and the state of each locale.
+        """
+        ranking = get_ranking_policy(ranking)
+        tasks = {locale: asyncio.ensure_future(self.foods_search_v3(
+            search_expression=search_expression, max_results=max_results, region=locale[0], language=locale[1],
+            **kwargs))
+            for locale in get_locales(locales)}
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=deadline)
+
+        results_by_locale, errors, timed_out = {}, {}, []
+        for locale, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                timed_out.append(locale)
+            elif task.exception() is not None:
+                errors[locale] = task.exception()
+            else:
+                results_by_locale[locale] = get_search_foods(task.result())
+        return merge_locale_results(results_by_locale, errors, timed_out, ranking)
+
+    async def get_many(self, food_ids, include_sub_categories=None, flag_default_serving=None, region=None,
+                       language=None, **kwargs) -> list[BatchResult]:
+        """
+        Returns the details of many foods, like calling `food_get_v4` for each of them.
+
+        Duplicate IDs are fetched once and the others are fetched concurrently; foods in the
+        client's cache are returned without a call.
+
+        Args:
+            food_ids (Iterable): Food IDs
+            include_sub_categories (Boolean, optional): Response will include the names of all sub categories associated with the food
+            flag_default_serving (Boolean, optional): The response will flag one of the servings as the default serving
+            region (String, optional): Results will be filtered by region. E.G.: "FR" returns results from France
+            language (String, optional): (Ignored unless region is also specified) Results will be in the specified language
+            **kwargs: Other parameters of `food_get_v4`
+
+        Returns:
+            list[BatchResult]: One result per given ID, in the same order, holding either the
+            response of `food_get_v4` or the exception of its call.
+        """
+        food_ids = [str(food_id) for food_id in food_ids]
+        unique_food_ids = list(dict.fromkeys(food_ids))
+        responses = await asyncio.gather(
+            *(self.food_get_v4(food_id, include_sub_categories=include_sub_categories,
+                               flag_default_serving=flag_default_serving, region=region, language=language, **kwargs)
+              for food_id in unique_food_ids),
+            return_exceptions=True)
+        results = {food_id: BatchResult(error=response) if isinstance(response, Exception) else BatchResult(value=response)
+                   for food_id, response in zip(unique_food_ids, responses)}
+        return [results[food_id] for food_id in food_ids]
+
+
+class AsyncRecipesExtensions(AsyncClientExtensions):
+    """
+    Hand-written methods of `AsyncRecipes`.
+    """
+
+    def iter_recipes_search_v3(self, search_expression=None, max_results=50, prefetch=0, max_items=None,
+                               **kwargs):
+        """
+        Iterates lazily over all recipes found by `recipes_search_v3`, fetching the pages as needed.
+
+        Only the current page and the prefetched pages are held in memory.
+
+        Args:
+            search_expression (String, optional): Search expression to match on recipe names
+            max_results (Int, optional): Number of recipes per page, at most 50
+            prefetch (Int, optional): Number of following pages to fetch concurrently
+            max_items (Int, optional): Maximum number of recipes to yield
+            **kwargs: Other parameters of `recipes_search_v3`, e.g. recipe_types or region
+
+        Yields:
+            dict: The recipes, in the order of the search results, to be consumed with `async for`.
+        """
+        return self._iterate_pages(
+            lambda page_number: self.recipes_search_v3(search_expression=search_expression,
+                                                       page_number=page_number, max_results=max_results, **kwargs),
+            lambda response: response.get('recipes') or {},
+            lambda page_data: page_data.get('recipe'),
+            max_results, prefetch, max_items)
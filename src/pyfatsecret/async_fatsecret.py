@@ -0,0 +1,65 @@
+from pyfatsecret.async_fatsecret_base import AsyncFatsecretBase
+from pyfatsecret.async_extensions import AsyncFoodsExtensions
+from pyfatsecret.async_extensions import AsyncRecipesExtensions
+from pyfatsecret.facade import AsyncFatsecretFacade
+from pyfatsecret.foods import Foods
+from pyfatsecret.recipes import Recipes
+from pyfatsecret.profile_foods import ProfileFoods
+from pyfatsecret.profile_recipes import ProfileRecipes
+from pyfatsecret.profile_saved_meals import ProfileSavedMeals
+from pyfatsecret.profile_auth import ProfileAuth
+from pyfatsecret.profile_food_diary import ProfileFoodDiary
+from pyfatsecret.profile_exercise_diary import ProfileExerciseDiary
+from pyfatsecret.profile_weight_diary import ProfileWeightDiary
+
+
+class AsyncFoods(AsyncFoodsExtensions, AsyncFatsecretBase, Foods):
+    pass
+
+
+class AsyncRecipes(AsyncRecipesExtensions, AsyncFatsecretBase, Recipes):
+    pass
+
+
+class AsyncProfileFoods(AsyncFatsecretBase, ProfileFoods):
+    pass
+
+
+class AsyncProfileRecipes(AsyncFatsecretBase, ProfileRecipes):
+    pass
+
+
+class AsyncProfileSavedMeals(AsyncFatsecretBase, ProfileSavedMeals):
+    pass
+
+
+class AsyncProfileAuth(AsyncFatsecretBase, ProfileAuth):
+    pass
+
+
+class AsyncProfileFoodDiary(AsyncFatsecretBase, ProfileFoodDiary):
+    pass
+
+
+class AsyncProfileExerciseDiary(AsyncFatsecretBase, ProfileExerciseDiary):
+    pass
+
+
+class AsyncProfileWeightDiary(AsyncFatsecretBase, ProfileWeightDiary):
+    pass
+
+
+class AsyncFatsecret(AsyncFatsecretFacade):
+
+    def __init__(self, client_id: str, client_secret: str, **kwargs) -> None:
+        super().__init__(client_id, client_secret, **kwargs)
+        kwargs = self.client_kwargs
+        self.foods = AsyncFoods(**kwargs)
+        self.recipes = AsyncRecipes(**kwargs)
+        self.profile_foods = AsyncProfileFoods(**kwargs)
+        self.profile_recipes = AsyncProfileRecipes(**kwargs)
+        self.profile_saved_meals = AsyncProfileSavedMeals(**kwargs)
+        self.profile_auth = AsyncProfileAuth(**kwargs)
+        self.profile_food_diary = AsyncProfileFoodDiary(**kwargs)
+        self.profile_exercise_diary = AsyncProfileExerciseDiary(**kwargs)
+        self.profile_weight_diary = AsyncProfileWeightDiary(**kwargs)
@@ -0,0 +1,220 @@
+import asyncio
+import contextlib
+import contextvars
+from pyfatsecret.async_token_manager import AsyncTokenManager
+from pyfatsecret.async_transport import AsyncTransport
+from pyfatsecret.cache import get_cache_key
+from pyfatsecret.decoding import loads
+from pyfatsecret.errors import check_response, FatsecretInvalidTokenError
+from pyfatsecret.fatsecret_base import FatsecretBase
+from pyfatsecret.methods import is_read_method
+from pyfatsecret.retry import RetryPolicy
+from pyfatsecret.single_flight import AsyncSingleFlight
+
+_deadline = contextvars.ContextVar('pyfatsecret_deadline', default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """
+    Limits the time that all async API calls made inside the block may take together.
+
+    The deadline is inherited by tasks created inside the block, e.g. by `asyncio.gather`.
+    Calls that don't finish in time raise `asyncio.TimeoutError`.
+
+    Parameters:
+        seconds (float): Seconds from now until the deadline.
+    """
+    loop = asyncio.get_running_loop()
+    token = _deadline.set(loop.time() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class AsyncFatsecretBase:
+    """
+    Mixin that turns a generated `FatsecretBase` subclass into an async client.
+
+    It must come before the generated class in the bases, e.g.
+    `class AsyncFoods(AsyncFatsecretBase, Foods)`. The generated methods return the
+    result of `make_request`, which here is a coroutine, so all of them become awaitable.
+    Calls can be cancelled like any other task.
+    """
+
+    API_URL = FatsecretBase.API_URL
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Initializes the async client. No I/O is done here.
+
+        Parameters:
+            client_id (str): Your FatSecret application client ID.
+            client_secret (str): Your FatSecret application client secret key.
+            token_manager (AsyncTokenManager, optional): Token manager shared with other clients.
+            transport (AsyncTransport, optional): Async transport shared with other clients.
+            request_timeout (float, optional): Default limit in seconds for a single API call.
+            rate_limiter (RateLimiter, optional): Rate limiter shared with other clients.
+            retry_policy (RetryPolicy, optional): Policy for sending failed calls again.
+                Defaults to `RetryPolicy()`.
+            cache (ResponseCache, optional): Cache for responses of read methods, shared with other clients.
+                Caches that do blocking I/O, e.g. `SQLiteDetailCache`, are called on a worker thread.
+            single_flight (AsyncSingleFlight, optional): Coalesces identical calls of read methods that
+                are in flight at the same time, shared with other clients. Pass False to send every call.
+            json_loads (Callable[[bytes], Any], optional): Decoder of the response bodies. Defaults to
+                `decoding.loads`, which uses orjson if it is installed.
+        """
+        self.client_id = kwargs['client_id']
+        self.client_secret = kwargs['client_secret']
+        self.transport = kwargs.get('transport') or AsyncTransport()
+        self.token_manager = kwargs.get('token_manager') or AsyncTokenManager(
+            self.client_id, self.client_secret, transport=self.transport)
+        self.request_timeout = kwargs.get('request_timeout')
+        self.rate_limiter = kwargs.get('rate_limiter')
+        self.retry_policy = kwargs.get('retry_policy') or RetryPolicy()
+        self.cache = kwargs.get('cache')
+        self.single_flight = kwargs.get('single_flight', AsyncSingleFlight())
+        self.json_loads = kwargs.get('json_loads') or loads
+        # Keeps references to the background tasks until they are done.
+        self._revalidation_tasks = set()
+
+    async def get_new_access_token(self) -> dict:
+        """
+        Requests a new access token from the FatSecret OAuth 2.0 endpoint using client credentials.
+
+        Returns:
+            dict: A dictionary containing the access token and other data.
+        """
+        return await self.token_manager.get_new_access_token()
+
+    @property
+    def access_token(self):
+        """
+        Provides the current access token, refreshing it if it's close to expiring.
+
+        Returns:
+            Awaitable[str]: The access token.
+        """
+        return self.token_manager.get_access_token()
+
+    def _get_timeout(self, timeout: float = None) -> float:
+        """
+        Returns the seconds left for a call, considering `timeout`, the default timeout,
+        the deadline of the retry policy and the deadline set by `deadline`, or None if
+        the call is not limited.
+        """
+        timeouts = [t for t in (timeout, self.request_timeout,
+                                self.retry_policy.deadline) if t is not None]
+        call_deadline = _deadline.get()
+        if call_deadline is not None:
+            timeouts.append(call_deadline - asyncio.get_running_loop().time())
+        return min(timeouts) if timeouts else None
+
+    async def _send_request(self, method: str, params: dict) -> dict:
+        """
+        Sends a single request and raises the matching `FatsecretError` if it failed.
+        """
+        access_token = await self.access_token
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(method)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        response = await self.transport.post(
+            self.API_URL, headers=headers, params=params)
+        try:
+            data = self.json_loads(response.content)
+        except ValueError:
+            data = None
+        try:
+            check_response(method, response.status_code, data)
+        except FatsecretInvalidTokenError:
+            self.token_manager.invalidate(access_token)
+            raise
+        if self.cache is not None:
+            await self._call_cache(self.cache.set, method, params, data, len(response.content))
+        return data
+
+    async def _call_cache(self, func, *args):
+        """
+        Calls a method of the cache, on a worker thread if the cache does blocking I/O.
+        """
+        if getattr(self.cache, 'blocking', True):
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def _send_request_with_retries(self, method: str, params: dict) -> dict:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await self._send_request(method, params)
+            except Exception as error:
+                if attempt >= self.retry_policy.max_attempts or \
+                        not self.retry_policy.is_retryable(error, method, self.transport):
+                    raise
+                await asyncio.sleep(self.retry_policy.get_delay(attempt))
+
+    async def _revalidate(self, method: str, params: dict) -> None:
+        """
+        Fetches a fresh response for a stale cache entry. Errors are ignored since the
+        stale response has already been returned.
+        """
+        try:
+            await self._send_request_with_retries(method, params)
+        except Exception:
+            pass
+
+    async def make_request(self, method: str, params: dict = None, timeout: float = None) -> dict:
+        """
+        Makes a request to the FatSecret API using the obtained access token.
+
+        Failed calls are sent again according to the retry policy of the client.
+        Responses of read methods are served from the cache of the client if it has one.
+        Stale cached responses are returned right away and refreshed in a background task.
+        Identical calls of read methods that are in flight at the same time are sent only once.
+
+        Parameters:
+            method (str): The API method to call.
+            params (dict, optional): Additional parameters for the API request.
+            timeout (float, optional): Limit in seconds for this call, including retries.
+
+        Raises:
+            FatsecretError: when the API returns an error, see `pyfatsecret.errors`.
+            httpx.TransportError: when the request fails and can't be retried.
+            asyncio.TimeoutError: when the call doesn't finish in time.
+
+        Returns:
+            dict: The JSON response from the API.
+        """
+        if params is None:
+            params = {}
+        params['method'] = method
+        params['format'] = 'json'
+
+        if self.cache is not None:
+            cache_entry = await self._call_cache(self.cache.get_entry, method, params)
+            if cache_entry is not None:
+                cached_response, stale = cache_entry
+                if stale:
+                    task = asyncio.ensure_future(
+                        self._revalidate(method, params))
+                    self._revalidation_tasks.add(task)
+                    task.add_done_callback(self._revalidation_tasks.discard)
+                return cached_response
+
+        if self.single_flight and is_read_method(method):
+            request = self.single_flight.do(get_cache_key(method, params),
+                                            lambda: self._send_request_with_retries(method, params))
+        else:
+            request = self._send_request_with_retries(method, params)
+
+        timeout = self._get_timeout(timeout)
+        if timeout is None:
+            return await request
+        if timeout <= 0:
+            request.close()
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(request, timeout)
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from pyfatsecret.async_transport import AsyncTransport
+from pyfatsecret.errors import check_token_response
+from pyfatsecret.token_manager import TokenManager
+
+
+class AsyncTokenManager:
+    """
+    Asynchronous counterpart of `TokenManager`.
+
+    It never does I/O on construction; the first token is requested on first use.
+    Only one coroutine refreshes the token at a time. Once the token gets close to
+    expiring it is renewed in a background task while callers keep using it.
+    """
+
+    TOKEN_URL = TokenManager.TOKEN_URL
+    REFRESH_MARGIN = TokenManager.REFRESH_MARGIN
+
+    def __init__(self, client_id: str, client_secret: str, transport: AsyncTransport = None) -> None:
+        """
+        Initializes the token manager.
+
+        Parameters:
+            client_id (str): Your FatSecret application client ID.
+            client_secret (str): Your FatSecret application client secret key.
+            transport (AsyncTransport, optional): Transport used for the token requests.
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.transport = transport or AsyncTransport()
+        # (token data, expiry timestamp), see `TokenManager`.
+        self._token = None
+        self._lock = asyncio.Lock()
+        self._renewal_task = None
+
+    async def get_new_access_token(self) -> dict:
+        """
+        Requests a new access token from the FatSecret OAuth 2.0 endpoint using client credentials.
+
+        Raises:
+            FatsecretAuthError: when no token was returned, e.g. because of invalid credentials.
+
+        Returns:
+            dict: A dictionary containing the access token and other data.
+        """
+        data = {'grant_type': 'client_credentials'}
+        response = await self.transport.post(self.TOKEN_URL, data=data,
+                                             auth=(self.client_id, self.client_secret))
+        try:
+            token_data = response.json()
+        except ValueError:
+            token_data = None
+        check_token_response(response.status_code, token_data)
+        return token_data
+
+    async def refresh(self) -> None:
+        """
+        Replaces the current access token with a new one.
+        """
+        time_token_was_requested = time.time()
+        token_data = await self.get_new_access_token()
+        self._token = (token_data, time_token_was_requested +
+                       token_data.get('expires_in'))
+
+    async def _refresh_if_needed(self) -> None:
+        async with self._lock:
+            if self.access_token_expires_in < self.REFRESH_MARGIN:
+                await self.refresh()
+
+    async def _renew(self) -> None:
+        try:
+            await self._refresh_if_needed()
+        except Exception:
+            # The current token is still valid; the next call tries again.
+            pass
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Marks the token as expired if it is still the current one, e.g. after the API rejected it.
+
+        Parameters:
+            access_token (str): The rejected access token.
+        """
+        token = self._token
+        if token is not None and token[0].get('access_token') == access_token:
+            # Marked as expired rather than removed, so that concurrent readers never see None.
+            self._token = (token[0], 0.0)
+
+    async def get_access_token(self) -> str:
+        """
+        Provides the current access token, refreshing it if it's close to expiring.
+
+        Only an expired token makes the caller wait. A token that is about to expire
+        is renewed in a background task and returned meanwhile.
+
+        Returns:
+            str: The access token.
+        """
+        expires_in = self.access_token_expires_in
+        if expires_in <= 0:
+            await self._refresh_if_needed()
+        elif expires_in < self.REFRESH_MARGIN and not self._lock.locked() and \
+                (self._renewal_task is None or self._renewal_task.done()):
+            self._renewal_task = asyncio.ensure_future(self._renew())
+
+        return self._token[0].get('access_token')
+
+    @property
+    def access_token_expires_in(self) -> float:
+        """
+        Calculates the time in seconds until the current access token expires.
+
+        Returns:
+            float: The number of seconds until the access token expires, 0 if there is no token yet.
+        """
+        token = self._token
+        if token is None:
+            return 0.0
+        return token[1] - time.time()
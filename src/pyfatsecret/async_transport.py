@@ -0,0 +1,58 @@
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncTransport:
+    """
+    Asynchronous HTTP transport with a persistent, keep-alive connection pool.
+
+    One transport is meant to be shared by all async clients on an event loop.
+    Requires `httpx`, which is installed with `pip install pyfatsecret[async]`.
+    """
+
+    # Errors raised before the request was sent, and all retryable network errors.
+    CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout) if httpx else ()
+    TRANSIENT_ERRORS = (httpx.TransportError,) if httpx else ()
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0) -> None:
+        """
+        Initializes the transport.
+
+        Parameters:
+            max_connections (int, optional): Maximum number of concurrent connections.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept alive.
+            connect_timeout (float, optional): Seconds to wait for a connection to be established.
+            read_timeout (float, optional): Seconds to wait for the server to send a response.
+
+        Raises:
+            ImportError: when `httpx` is not installed.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncTransport requires httpx: pip install pyfatsecret[async]")
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout))
+
+    async def post(self, url: str, **kwargs):
+        """
+        Sends a POST request over a pooled connection.
+
+        Parameters:
+            url (str): The URL to post to.
+            **kwargs: Passed on to `httpx.AsyncClient.post`.
+
+        Returns:
+            httpx.Response: The response.
+        """
+        return await self.client.post(url, **kwargs)
+
+    async def close(self) -> None:
+        """
+        Closes all pooled connections.
+        """
+        await self.client.aclose()
@@ -0,0 +1,190 @@
+"""
+Module `autocomplete.py` answers autocomplete prefixes locally when possible and calls
+`foods_autocomplete_v2` only when needed.
+"""
+import bisect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from pyfatsecret.utils import as_list
+
+
+def normalize_text(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def matches_prefix(text: str, prefix: str) -> bool:
+    """
+    Whether a word of the normalized text starts with the normalized prefix.
+    """
+    return text.startswith(prefix) or f' {prefix}' in text
+
+
+class PrefixIndex:
+    """
+    Compact index of names that finds those with a word starting with a prefix.
+
+    The keys (each name from each of its words on) are kept in one sorted list, so a
+    lookup is a binary search followed by a scan of the matching keys.
+    """
+
+    def __init__(self, names=()) -> None:
+        self._keys = []
+        self._names = set()
+        self._lock = threading.Lock()
+        self.add(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, names) -> None:
+        """
+        Adds names, e.g. suggestions or food names. Names that are already indexed are ignored.
+        """
+        with self._lock:
+            new_keys = []
+            for name in names:
+                if not name or name in self._names:
+                    continue
+                self._names.add(name)
+                words = normalize_text(name).split(' ')
+                new_keys += [(' '.join(words[position:]), name) for position in range(len(words))]
+            if len(new_keys) > len(self._keys) // 8:
+                self._keys = sorted(self._keys + new_keys)
+            else:
+                for key in new_keys:
+                    bisect.insort(self._keys, key)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Returns at most `limit` names with a word starting with the prefix, matches from the
+        first word first, then in alphabetical order.
+        """
+        prefix = normalize_text(prefix)
+        keys = self._keys
+        leading, others = [], []
+        seen = set()
+        for key, name in itertools.islice(keys, bisect.bisect_left(keys, (prefix,)), None):
+            if not key.startswith(prefix):
+                break
+            if name not in seen:
+                seen.add(name)
+                (leading if normalize_text(name).startswith(prefix) else others).append(name)
+        return (leading + others)[:limit]
+
+
+class Autocompleter:
+    """
+    Local autocomplete layer over `foods_autocomplete_v2`.
+
+    A prefix is answered without a call when:
+
+    - it was asked before (the results of the last `max_prefixes` prefixes are kept),
+    - a shorter prefix returned fewer than `max_results` suggestions, i.e. all of them, which
+      are then narrowed down to the longer prefix,
+    - or, with `local_threshold`, the local index holds at least that many matches.
+
+    With `debounce`, calls of the same session (e.g. one text field of one user) wait that
+    long and only the last keystroke of a rapid stream calls the API; the calls it
+    superseded return None. Identical prefixes of different sessions are sent only once
+    while in flight, like any other read call of the client.
+    """
+
+    def __init__(self, foods, max_results: int = 10, debounce: float = 0.0, local_threshold: int = None,
+                 max_prefixes: int = 10000, region: str = None, language: str = None) -> None:
+        """
+        Parameters:
+            foods (Foods): Client used for the calls of `foods_autocomplete_v2`.
+            max_results (int, optional): Number of suggestions per prefix, at most 10.
+            debounce (float, optional): Seconds that calls of a session wait for a following keystroke.
+            local_threshold (int, optional): Answer from the local index if it has at least this
+                many matches. Disabled by default since the order differs from the API's.
+            max_prefixes (int, optional): Number of prefixes whose results are kept.
+            region (String, optional): Results will be filtered by region.
+            language (String, optional): Results will be in the specified language.
+        """
+        self.foods = foods
+        self.max_results = max_results
+        self.debounce = debounce
+        self.local_threshold = local_threshold
+        self.max_prefixes = max_prefixes
+        self.region = region
+        self.language = language
+        self.index = PrefixIndex()
+        # Normalized prefix -> (suggestions, whether they are all suggestions of the prefix).
+        self._results = OrderedDict()
+        self._latest_calls = {}
+        self._call_numbers = itertools.count()
+        self._lock = threading.Lock()
+
+    def lookup(self, prefix: str):
+        """
+        Returns the suggestions for the prefix if they can be answered locally, else None.
+        """
+        prefix = normalize_text(prefix)
+        with self._lock:
+            if prefix in self._results:
+                self._results.move_to_end(prefix)
+                return list(self._results[prefix][0])
+            for length in range(len(prefix) - 1, 0, -1):
+                suggestions, complete = self._results.get(prefix[:length], (None, False))
+                if complete:
+                    return [suggestion for suggestion in suggestions
+                            if matches_prefix(normalize_text(suggestion), prefix)]
+        if self.local_threshold is not None:
+            suggestions = self.index.complete(prefix, self.max_results)
+            if len(suggestions) >= self.local_threshold:
+                return suggestions
+        return None
+
+    def _store(self, prefix: str, suggestions: list) -> None:
+        with self._lock:
+            self._results[prefix] = (suggestions, len(suggestions) < self.max_results)
+            self._results.move_to_end(prefix)
+            while len(self._results) > self.max_prefixes:
+                self._results.popitem(last=False)
+        self.index.add(suggestions)
+
+    def _end_debounce(self, session, call_number: int) -> bool:
+        """
+        Returns whether the call is still the latest one of its session, and forgets the session if so.
+        """
+        with self._lock:
+            if self._latest_calls.get(session) != call_number:
+                return False
+            del self._latest_calls[session]
+            return True
+
+    def suggest(self, prefix: str, session=None):
+        """
+        Returns the suggestions for a prefix, locally if possible.
+
+        Parameters:
+            prefix (str): The text typed so far.
+            session (Hashable, optional): Identifies the keystroke stream for debouncing.
+
+        Returns:
+            list[str]: The suggestions, or None if a later call of the session superseded this one.
+        """
+        suggestions = self.lookup(prefix)
+        if suggestions is not None:
+            return suggestions
+
+        if self.debounce and session is not None:
+            call_number = next(self._call_numbers)
+            with self._lock:
+                self._latest_calls[session] = call_number
+            time.sleep(self.debounce)
+            if not self._end_debounce(session, call_number):
+                return None
+            # Another session may have asked for it meanwhile.
+            suggestions = self.lookup(prefix)
+            if suggestions is not None:
+                return suggestions
+
+        response = self.foods.foods_autocomplete_v2(prefix.strip(), max_results=self.max_results,
+                                                    region=self.region, language=self.language)
+        suggestions = as_list((response.get('suggestions') or {}).get('suggestion'))
+        self._store(normalize_text(prefix), suggestions)
+        return list(suggestions)
@@ -163,13 +163,15 @@ class AutoGenerator:
         return re.sub(r'(?<!^)(?=[A-Z])', '_', class_name).lower()
 
     @staticmethod
-    def generate_module_content(class_name: str, url_list: list[str]) -> str:
+    def generate_module_content(class_name: str, url_list: list[str], extension: str = None) -> str:
         """
         Generates a module containing a class with functions for API calls.
 
         Args:
             class_name (str): Class name
             url_list (list[str]): List of urls to functions that should belong to this module
+            extension (str, optional): Name of a class in 'extensions.py' with hand-written
+                methods that the class should inherit
         """
         module_content = f'"""\nModule \'{AutoGenerator.convert_class_to_module_name(
             class_name)}.py\' contains the following methods:\n'
@@ -177,8 +179,12 @@ class AutoGenerator:
             module_content += f"{AutoGenerator.INDENT}- {url}\n"
         module_content += f'\nand was generated on {
             datetime.now().strftime('%d.%m.%Y %H:%M')}.\n"""\n'
-        module_content += f"from pyfatsecret.fatsecret_base import FatsecretBase\n\n\n"
-        module_content += f"class {class_name}(FatsecretBase):\n\n"
+        module_content += f"from pyfatsecret.fatsecret_base import FatsecretBase\n"
+        bases = "FatsecretBase"
+        if extension:
+            module_content += f"from pyfatsecret.extensions import {extension}\n"
+            bases = f"{extension}, FatsecretBase"
+        module_content += f"\n\nclass {class_name}({bases}):\n\n"
         module_content += f"{
             AutoGenerator.INDENT}def __init__(self, **kwargs) -> None:\n"
         module_content += f"{AutoGenerator.INDENT}{
@@ -189,20 +195,21 @@ class AutoGenerator:
         return autopep8.fix_code(module_content)
 
     @staticmethod
-    def generate_module(class_name: str, url_list: list[str]) -> None:
+    def generate_module(class_name: str, url_list: list[str], extension: str = None) -> None:
         """
         Creates a module with the content from `generate_module_content`.
 
         Args:
             class_name (str): Class name
             url_list (list[str]): List of urls to functions that should belong to this module
+            extension (str, optional): Name of a class in 'extensions.py' that the class should inherit
         """
         current_dir = os.path.dirname(__file__)
         file_name = os.path.join(
             current_dir, AutoGenerator.convert_class_to_module_name(class_name) + '.py')
 
         module_content = AutoGenerator.generate_module_content(
-            class_name, url_list)
+            class_name, url_list, extension)
 
         with open(file_name, 'w', encoding='utf-8') as file:
             file.write(module_content)
@@ -244,25 +251,28 @@ class AutoGenerator:
         Given all modules information in the form
         | {
         |   'class_name': ...,
-        |   'url_list': [...]
+        |   'url_list': [...],
+        |   'extension': ... (optional)
         | },
         this function generates all modules and then combines them in the class 'Fatsecret'
-        in a main module called 'fatsecret.py'
+        in a main module called 'fatsecret.py'. All sub-clients receive the shared state
+        of `FatsecretFacade`. The async variants are combined in 'async_fatsecret.py'.
         """
         for info in modules_info:
             AutoGenerator.generate_module(**info)
 
-        content = ""
+        content = "from pyfatsecret.facade import FatsecretFacade\n"
 
         for info in modules_info:
             content += f"from pyfatsecret.{AutoGenerator.convert_class_to_module_name(
                 info['class_name'])} import {info['class_name']}\n"
 
-        content += "\n\nclass Fatsecret:\n\n"
+        content += "\n\nclass Fatsecret(FatsecretFacade):\n\n"
         content += AutoGenerator.INDENT + \
-            "def __init__(self, client_id: str, client_secret: str) -> None:\n"
+            "def __init__(self, client_id: str, client_secret: str, **kwargs) -> None:\n"
         content += AutoGenerator.INDENT*2 + \
-            "kwargs = {'client_id': client_id, 'client_secret': client_secret}\n"
+            "super().__init__(client_id, client_secret, **kwargs)\n"
+        content += AutoGenerator.INDENT*2 + "kwargs = self.client_kwargs\n"
 
         for info in modules_info:
             content += AutoGenerator.INDENT*2 + f"self.{AutoGenerator.convert_class_to_module_name(
@@ -275,16 +285,65 @@ class AutoGenerator:
 
         print(f"Module {fatsecret_py} created successfully.")
 
+        async_fatsecret_py = os.path.join(current_dir, "async_fatsecret.py")
+        with open(async_fatsecret_py, 'w', encoding='utf-8') as async_fatsecret_file:
+            async_fatsecret_file.write(
+                AutoGenerator.generate_async_api_content(*modules_info))
+
+        print(f"Module {async_fatsecret_py} created successfully.")
+
+    @staticmethod
+    def generate_async_api_content(*modules_info) -> str:
+        """
+        Generates the module 'async_fatsecret.py' with an async variant of every class
+        and the class 'AsyncFatsecret' that combines them.
+        """
+        content = "from pyfatsecret.async_fatsecret_base import AsyncFatsecretBase\n"
+        for info in modules_info:
+            if info.get('extension'):
+                content += f"from pyfatsecret.async_extensions import Async{info['extension']}\n"
+        content += "from pyfatsecret.facade import AsyncFatsecretFacade\n"
+
+        for info in modules_info:
+            module_name = AutoGenerator.convert_class_to_module_name(
+                info['class_name'])
+            content += f"from pyfatsecret.{module_name} import {info['class_name']}\n"
+
+        for info in modules_info:
+            # The async extensions replace the blocking methods of the sync extensions.
+            bases = f"AsyncFatsecretBase, {info['class_name']}"
+            if info.get('extension'):
+                bases = f"Async{info['extension']}, {bases}"
+            content += f"\n\nclass Async{info['class_name']}({bases}):\n"
+            content += AutoGenerator.INDENT + "pass\n"
+
+        content += "\n\nclass AsyncFatsecret(AsyncFatsecretFacade):\n\n"
+        content += AutoGenerator.INDENT + \
+            "def __init__(self, client_id: str, client_secret: str, **kwargs) -> None:\n"
+        content += AutoGenerator.INDENT*2 + \
+            "super().__init__(client_id, client_secret, **kwargs)\n"
+        content += AutoGenerator.INDENT*2 + "kwargs = self.client_kwargs\n"
+
+        for info in modules_info:
+            module_name = AutoGenerator.convert_class_to_module_name(
+                info['class_name'])
+            content += AutoGenerator.INDENT*2 + \
+                f"self.{module_name} = Async{info['class_name']}(**kwargs)\n"
+
+        return autopep8.fix_code(content)
+
 
 if __name__ == '__main__':
 
     FOODS = {
         'class_name': 'Foods',
-        'url_list': AutoGenerator.get_urls_from_categories("Foods", "Food Brands", "Food Categories", "Food Sub Categories")
+        'url_list': AutoGenerator.get_urls_from_categories("Foods", "Food Brands", "Food Categories", "Food Sub Categories"),
+        'extension': 'FoodsExtensions'
     }
     RECIPES = {
         'class_name': 'Recipes',
-        'url_list': AutoGenerator.get_urls_from_categories("Recipes", "Recipe Types")
+        'url_list': AutoGenerator.get_urls_from_categories("Recipes", "Recipe Types"),
+        'extension': 'RecipesExtensions'
     }
     PROFILE_FOODS = {
         'class_name': 'ProfileFoods',
@@ -0,0 +1,261 @@
+"""
+Module `barcodes.py` normalizes barcodes and resolves them in bulk with `food.find_id_for_barcode`.
+"""
+import sqlite3
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
+from pyfatsecret.errors import FatsecretApplicationError
+
+
+def get_check_digit(digits: str) -> str:
+    """
+    Returns the GTIN check digit for the given digits (without check digit).
+    """
+    total = sum(int(digit) * (3 if i % 2 == 0 else 1)
+                for i, digit in enumerate(reversed(digits)))
+    return str((10 - total % 10) % 10)
+
+
+def expand_upc_e(upc_e: str) -> str:
+    """
+    Converts a UPC-E barcode to UPC-A.
+
+    Parameters:
+        upc_e (str): 6 digits (number system 0 and check digit are added), 7 digits
+            (with number system) or 8 digits (with number system and check digit).
+
+    Raises:
+        ValueError: when the barcode is not a valid UPC-E barcode.
+
+    Returns:
+        str: The 12-digit UPC-A barcode.
+    """
+    if len(upc_e) == 6:
+        upc_e = '0' + upc_e
+    if len(upc_e) not in (7, 8) or upc_e[0] not in '01':
+        raise ValueError(f"'{upc_e}' is not a UPC-E barcode")
+    number_system, d = upc_e[0], upc_e[1:7]
+    last = d[5]
+    if last in '012':
+        body = d[0:2] + last + '0000' + d[2:5]
+    elif last == '3':
+        body = d[0:3] + '00000' + d[3:5]
+    elif last == '4':
+        body = d[0:4] + '00000' + d[4]
+    else:
+        body = d[0:5] + '0000' + last
+    upc_a = number_system + body
+    check_digit = get_check_digit(upc_a)
+    if len(upc_e) == 8 and upc_e[7] != check_digit:
+        raise ValueError(f"'{upc_e}' has an invalid check digit")
+    return upc_a + check_digit
+
+
+def normalize_barcode(barcode, upc_e: bool = False) -> str:
+    """
+    Converts a UPC-A, UPC-E, EAN-8, EAN-13 or GTIN-14 barcode to the GTIN-13 format that
+    `food_find_id_for_barcode` expects. Spaces and dashes are ignored.
+
+    Parameters:
+        barcode (str or int): The barcode.
+        upc_e (bool, optional): Treat 8-digit barcodes as UPC-E instead of EAN-8. Barcodes
+            with 6 or 7 digits are always UPC-E.
+
+    Raises:
+        ValueError: when the barcode has an invalid length or check digit.
+
+    Returns:
+        str: The 13-digit GTIN-13.
+    """
+    digits = str(barcode).strip().replace(' ', '').replace('-', '')
+    if not digits.isdigit():
+        raise ValueError(f"'{barcode}' is not a barcode")
+    if len(digits) in (6, 7) or (len(digits) == 8 and upc_e):
+        digits = expand_upc_e(digits)
+    if len(digits) == 14 and digits[0] == '0':
+        digits = digits[1:]
+    if len(digits) not in (8, 12, 13):
+        raise ValueError(f"'{barcode}' has an invalid length")
+    if get_check_digit(digits[:-1]) != digits[-1]:
+        raise ValueError(f"'{barcode}' has an invalid check digit")
+    return digits.zfill(13)
+
+
+class BarcodeResult:
+    """
+    Result of resolving one barcode.
+
+    Attributes:
+        barcode: The barcode as given.
+        gtin (str): The normalized GTIN-13, None if the barcode is invalid.
+        food_id (str): The ID of the food, None if no food has this barcode.
+        food (dict): The response of `food_get_v4`, if the food was hydrated.
+        error (Exception): The error that occurred, if any.
+    """
+
+    __slots__ = ('barcode', 'gtin', 'food_id', 'food', 'error')
+
+    def __init__(self, barcode, gtin: str = None, food_id: str = None, food: dict = None,
+                 error: Exception = None) -> None:
+        self.barcode = barcode
+        self.gtin = gtin
+        self.food_id = food_id
+        self.food = food
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"BarcodeResult(barcode={self.barcode!r}, gtin={self.gtin!r}, food_id={self.food_id!r}, " \
+            f"error={self.error!r})"
+
+
+class _BarcodeCheckpoint:
+    """
+    SQLite table of the barcodes that were resolved, including misses.
+    """
+
+    COMMIT_INTERVAL = 100
+
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS barcodes (gtin TEXT PRIMARY KEY, food_id TEXT, resolved_at REAL)')
+        self._uncommitted = 0
+
+    def get(self, gtin: str):
+        return self.connection.execute('SELECT food_id, resolved_at FROM barcodes WHERE gtin = ?',
+                                       (gtin,)).fetchone()
+
+    def add(self, gtin: str, food_id: str) -> None:
+        self.connection.execute('INSERT OR REPLACE INTO barcodes VALUES (?, ?, ?)',
+                                (gtin, food_id, time.time()))
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_INTERVAL:
+            self.commit()
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.connection.close()
+
+
+class BarcodeResolver:
+    """
+    Streaming pipeline that resolves many barcodes to foods.
+
+    Barcodes are normalized to GTIN-13 and deduplicated, then resolved with
+    `food_find_id_for_barcode` and optionally hydrated with `food_get_v4`, concurrently
+    on the client's executor, or one after the other on a thread of that executor. With a checkpoint file, every resolved barcode is recorded:
+    a run that is started again skips the barcodes that were done, and barcodes without
+    a food are not looked up again until `negative_ttl` has passed.
+
+    Example:
+        |   resolver = BarcodeResolver(fatsecret.foods, checkpoint_path='catalog.db')
+        |   for result in resolver.resolve(read_barcodes('catalog.csv')):
+        |       ...
+    """
+
+    def __init__(self, foods, checkpoint_path: str = None, hydrate: bool = True, max_in_flight: int = 32,
+                 negative_ttl: float = 7 * 86400, region: str = None, language: str = None,
+                 upc_e: bool = False) -> None:
+        """
+        Parameters:
+            foods (Foods): The client to use.
+            checkpoint_path (str, optional): SQLite file to record resolved barcodes in.
+            hydrate (bool, optional): Fetch the details of found foods with `food_get_v4`.
+            max_in_flight (int, optional): Maximum number of barcodes being resolved at once.
+            negative_ttl (float, optional): Seconds after which a barcode without a food is looked up again.
+            region (str, optional): Region for the lookups.
+            language (str, optional): Language for the lookups.
+            upc_e (bool, optional): Treat 8-digit barcodes as UPC-E instead of EAN-8.
+        """
+        self.foods = foods
+        self.checkpoint_path = checkpoint_path
+        self.hydrate = hydrate
+        self.max_in_flight = max_in_flight
+        self.negative_ttl = negative_ttl
+        self.region = region
+        self.language = language
+        self.upc_e = upc_e
+
+    def _resolve_one(self, barcode, gtin: str) -> BarcodeResult:
+        result = BarcodeResult(barcode, gtin)
+        try:
+            response = self.foods.food_find_id_for_barcode(
+                gtin, region=self.region, language=self.language)
+        except FatsecretApplicationError:
+            # FatSecret reports unknown barcodes as an error; it's a miss.
+            return result
+        except Exception as error:
+            result.error = error
+            return result
+        food_id = str((response.get('food_id') or {}).get('value') or 0)
+        if food_id != '0':
+            result.food_id = food_id
+            if self.hydrate:
+                try:
+                    result.food = self.foods.food_get_v4(
+                        food_id, region=self.region, language=self.language)
+                except Exception as error:
+                    result.error = error
+        return result
+
+    def _is_done(self, checkpoint: _BarcodeCheckpoint, gtin: str) -> bool:
+        row = checkpoint.get(gtin)
+        if row is None:
+            return False
+        food_id, resolved_at = row
+        return food_id is not None or time.time() - resolved_at < self.negative_ttl
+
+    def resolve(self, barcodes):
+        """
+        Resolves the barcodes. The input is consumed lazily, so it can be larger than memory.
+
+        Parameters:
+            barcodes (Iterable): Barcodes as strings or integers.
+
+        Yields:
+            BarcodeResult: One result per new GTIN, in the order in which they finish. Invalid
+            barcodes are yielded with a ValueError. Barcodes that were done in an earlier run
+            with the same checkpoint, and duplicates, are skipped. A result is recorded in the
+            checkpoint when the next one is requested, and only if it has no error.
+        """
+        checkpoint = _BarcodeCheckpoint(
+            self.checkpoint_path) if self.checkpoint_path else None
+        seen = set()
+        pending = set()
+        try:
+            for barcode in barcodes:
+                try:
+                    gtin = normalize_barcode(barcode, self.upc_e)
+                except ValueError as error:
+                    yield BarcodeResult(barcode, error=error)
+                    continue
+                if gtin in seen or (checkpoint is not None and self._is_done(checkpoint, gtin)):
+                    continue
+                seen.add(gtin)
+                pending.add(self.foods.submit(
+                    self._resolve_one, barcode, gtin))
+                if len(pending) >= self.max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._finish(done, checkpoint)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._finish(done, checkpoint)
+        finally:
+            for future in pending:
+                future.cancel()
+            if checkpoint is not None:
+                checkpoint.close()
+
+    @staticmethod
+    def _finish(futures, checkpoint: _BarcodeCheckpoint):
+        for future in futures:
+            result = future.result()
+            yield result
+            # Recorded once the consumer asks for the next result, so that a result whose
+            # handling failed is resolved again by the next run.
+            if checkpoint is not None and result.error is None:
+                checkpoint.add(result.gtin, result.food_id)
@@ -0,0 +1,147 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+_current = threading.local()
+
+
+def is_executor_thread(executor: ThreadPoolExecutor) -> bool:
+    """
+    Whether the current thread is a worker of the executor that runs a call of `submit`.
+    """
+    return getattr(_current, 'executor', None) is executor
+
+
+def _run_on(executor: ThreadPoolExecutor, func, args, kwargs):
+    previous, _current.executor = getattr(_current, 'executor', None), executor
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _current.executor = previous
+
+
+def submit(executor: ThreadPoolExecutor, func, *args, **kwargs) -> Future:
+    """
+    Submits a call to the executor, or runs it right away when the current thread is one of
+    its workers running a call of `submit`. A worker that waited for calls queued behind it
+    could wait forever once all workers do so, e.g. when a helper that fans out calls is
+    itself run in a batch.
+
+    Returns:
+        Future: The future of the call, already done if it was run right away.
+    """
+    if not is_executor_thread(executor):
+        return executor.submit(_run_on, executor, func, args, kwargs)
+    future = Future()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+class BatchResult:
+    """
+    Result of one call of a `Batch`: either a value or the exception that the call raised.
+    """
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value=None, error: Exception = None) -> None:
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def get(self):
+        """
+        Returns the value of the call or raises its exception.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"BatchResult(value={self.value!r}, error={self.error!r})"
+
+
+class Batch:
+    """
+    Runs many API calls concurrently on a bounded thread pool.
+
+    The calls can be methods of any sub-client. Clients of one `Fatsecret` share their
+    connection pool, token and rate limiter, so a batch respects the configured rate limit.
+
+    Example:
+        |   with fatsecret.batch() as batch:
+        |       for food_id in food_ids:
+        |           batch.add(fatsecret.foods.food_get_v4, food_id)
+        |   foods = [result.value for result in batch.results if result.ok]
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor = None, max_workers: int = 8) -> None:
+        """
+        Parameters:
+            executor (ThreadPoolExecutor, optional): Thread pool to run the calls on. A pool with
+                `max_workers` threads is created for this batch if it is not given.
+            max_workers (int, optional): Number of threads if no executor is given.
+        """
+        self.executor = executor
+        self.max_workers = max_workers
+        self.calls = []
+        self.results = None
+
+    def add(self, func, *args, **kwargs) -> int:
+        """
+        Adds a call to the batch.
+
+        Parameters:
+            func (Callable): The method to call, e.g. `fatsecret.foods.food_get_v4`.
+            *args, **kwargs: Arguments of the call.
+
+        Returns:
+            int: Index of the result of this call in `results`.
+        """
+        self.calls.append((func, args, kwargs))
+        return len(self.calls) - 1
+
+    def map(self, func, iterable) -> None:
+        """
+        Adds one call of `func` per item of `iterable`, with the item as the only argument.
+        """
+        for item in iterable:
+            self.add(func, item)
+
+    @staticmethod
+    def _run(func, args, kwargs) -> BatchResult:
+        try:
+            return BatchResult(value=func(*args, **kwargs))
+        except Exception as error:
+            return BatchResult(error=error)
+
+    def execute(self) -> list[BatchResult]:
+        """
+        Runs all calls that were added and waits until they finished.
+
+        Returns:
+            list[BatchResult]: The results in the order in which the calls were added.
+        """
+        if self.executor is None:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self._run, *call)
+                           for call in self.calls]
+        else:
+            futures = [submit(self.executor, self._run, *call)
+                       for call in self.calls]
+        self.results = [future.result() for future in futures]
+        self.calls = []
+        return self.results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.execute()
@@ -0,0 +1,219 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from pyfatsecret.methods import is_read_method
+
+# Seconds that responses of slowly changing reference data are cached by default.
+DEFAULT_TTLS = {
+    'food.get.v4': 3600,
+    'food.find_id_for_barcode': 86400,
+    'food_brands.get.v2': 86400,
+    'food_categories.get.v2': 86400,
+    'food_sub_categories.get.v2': 86400,
+    'recipe.get.v2': 3600,
+    'recipe_types.get.v2': 86400,
+}
+
+
+def get_cache_key(method: str, params: dict) -> tuple:
+    """
+    Returns a key for an API call that doesn't depend on the order or the types of the
+    parameters, e.g. `food_id=1` and `food_id='1'` give the same key.
+
+    Parameters:
+        method (str): The API method.
+        params (dict): Parameters of the call as returned by `get_params`.
+
+    Returns:
+        tuple: The key.
+    """
+    normalized_params = []
+    for key, value in params.items():
+        if key in ('method', 'format'):
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        normalized_params.append((key, str(value)))
+    return (method, tuple(sorted(normalized_params)))
+
+
+def get_response_size(value) -> int:
+    """
+    Returns the size in bytes of a decoded response encoded as compact JSON.
+    """
+    return len(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+class ResponseCache:
+    """
+    Interface of a cache for API responses.
+
+    Clients call `get` before sending a request and `set` with the response of
+    successful calls. Implementations decide which methods they cache; they must never
+    cache methods that write data.
+
+    Attributes:
+        blocking (bool): Whether the cache does I/O, e.g. on disk. Async clients call such
+            caches on a worker thread so that they don't block the event loop.
+    """
+
+    blocking = True
+
+    def get(self, method: str, params: dict):
+        """
+        Returns the cached response of a call, None if it is not cached.
+        """
+        raise NotImplementedError
+
+    def get_entry(self, method: str, params: dict):
+        """
+        Returns the cached response of a call and whether it is stale, None if it is not cached.
+        Clients return stale responses right away and fetch a fresh one in the background.
+
+        Returns:
+            tuple[dict, bool] or None: The cached response and whether it is stale.
+        """
+        value = self.get(method, params)
+        return None if value is None else (value, False)
+
+    def set(self, method: str, params: dict, value: dict, size: int = 0) -> None:
+        """
+        Caches the response of a call.
+
+        Parameters:
+            method (str): The API method.
+            params (dict): Parameters of the call.
+            value (dict): The decoded response.
+            size (int, optional): Size of the response body in bytes.
+        """
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """
+    Thread-safe in-memory LRU cache with a time to live per method.
+
+    The least recently used responses are evicted when there are more than `max_entries`
+    responses or their bodies together are larger than `max_bytes`. Cached responses
+    are returned as they are, so callers must not modify them.
+    """
+
+    blocking = False
+
+    def __init__(self, ttls: dict = None, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """
+        Initializes the cache.
+
+        Parameters:
+            ttls (dict, optional): Seconds to cache the responses of each method. Methods that
+                are not listed are not cached. Defaults to `DEFAULT_TTLS`.
+            max_entries (int, optional): Maximum number of cached responses.
+            max_bytes (int, optional): Maximum total size of the cached response bodies.
+
+        Raises:
+            ValueError: when a TTL is given for a method that writes data.
+        """
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        for method in self.ttls:
+            if not is_read_method(method):
+                raise ValueError(f"'{method}' is not a read method and can't be cached")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        # key -> (value, size, expiry timestamp), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, method: str, params: dict):
+        if method not in self.ttls:
+            return None
+        key = get_cache_key(method, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, method: str, params: dict, value: dict, size: int = 0) -> None:
+        ttl = self.ttls.get(method)
+        if ttl is None or size > self.max_bytes:
+            return
+        key = get_cache_key(method, params)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        self.size -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        """
+        Removes all cached responses.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """
+        Returns statistics of the cache.
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'entries' and 'size' (total bytes of the
+            cached response bodies).
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'size': self.size}
+
+
+class TieredCache(ResponseCache):
+    """
+    Combines several caches, e.g. a `MemoryCache` in front of a `SQLiteDetailCache`.
+
+    Lookups go through the caches in order. A response found in a later cache is
+    copied into the earlier ones. Responses are stored in all caches.
+    """
+
+    def __init__(self, *caches: ResponseCache) -> None:
+        """
+        Parameters:
+            *caches (ResponseCache): The caches, fastest first.
+        """
+        self.caches = caches
+        self.blocking = any(getattr(cache, 'blocking', True) for cache in caches)
+
+    def get(self, method: str, params: dict):
+        entry = self.get_entry(method, params)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, method: str, params: dict):
+        for i, cache in enumerate(self.caches):
+            entry = cache.get_entry(method, params)
+            if entry is not None:
+                if not entry[1] and i > 0:
+                    # The size of the original body is not kept, so that of the compact JSON is used.
+                    size = get_response_size(entry[0])
+                    for faster_cache in self.caches[:i]:
+                        faster_cache.set(method, params, entry[0], size)
+                return entry
+        return None
+
+    def set(self, method: str, params: dict, value: dict, size: int = 0) -> None:
+        for cache in self.caches:
+            cache.set(method, params, value, size)
@@ -0,0 +1,79 @@
+"""
+Module `decoding.py` decodes the API responses and extracts selected fields from them.
+"""
+import json
+from pyfatsecret.utils import as_list
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(content: bytes):
+    """
+    Decodes a JSON response body from its bytes, with `orjson` if it is installed
+    (`pip install pyfatsecret[fast]`) and the standard library otherwise.
+
+    Raises:
+        ValueError: when the body is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def split_path(path: str) -> tuple:
+    return tuple(path.split('.')) if path else ()
+
+
+def get_path(value, segments: tuple):
+    """
+    Returns the value at the given path segments. A segment is a key, an index of a list or
+    '*' for all elements of a list; a single element given instead of a list counts as a
+    list of one element. Missing values are None.
+    """
+    for position, segment in enumerate(segments):
+        if segment == '*':
+            return [get_path(element, segments[position + 1:]) for element in as_list(value)]
+        if segment.isdigit():
+            elements = as_list(value)
+            value = elements[int(segment)] if int(segment) < len(elements) else None
+        elif isinstance(value, dict):
+            value = value.get(segment)
+        else:
+            return None
+    return value
+
+
+class Projection:
+    """
+    Extracts the given fields from responses, e.g. to keep only what is needed of a page of
+    search results.
+
+    Example:
+        |   projection = Projection('foods_search.results.food', food_id='food_id', food_name='food_name',
+        |                           calories='servings.serving.0.calories')
+        |   rows = projection(fatsecret.foods.foods_search_v3('milk'))
+    """
+
+    def __init__(self, root: str = None, **fields: str) -> None:
+        """
+        Parameters:
+            root (str, optional): Dotted path of the items, e.g. 'foods_search.results.food'.
+                Without root, the fields are extracted from the whole response.
+            **fields (str): Dotted paths of the fields to extract, relative to each item.
+        """
+        self.root = split_path(root)
+        self.fields = {name: split_path(path) for name, path in fields.items()}
+
+    def extract(self, item) -> dict:
+        return {name: get_path(item, segments) for name, segments in self.fields.items()}
+
+    def __call__(self, response: dict):
+        """
+        Returns a dict of the fields, or a list of such dicts, one per item, when a root is given.
+        """
+        if not self.root:
+            return self.extract(response)
+        return [self.extract(item) for item in as_list(get_path(response, self.root))]
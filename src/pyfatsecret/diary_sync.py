@@ -0,0 +1,212 @@
+"""
+Module `diary_sync.py` mirrors the food diary of a user incrementally.
+"""
+import datetime
+import json
+import sqlite3
+from concurrent.futures import wait, FIRST_COMPLETED
+from pyfatsecret.utils import as_list
+
+EPOCH = datetime.date(1970, 1, 1)
+
+
+def to_date_int(value) -> int:
+    """
+    Returns a date as the number of days since January 1, 1970, the date format of the API.
+
+    Parameters:
+        value (datetime.date or int): The date, or already the number of days.
+    """
+    if isinstance(value, datetime.date):
+        return (value - EPOCH).days
+    return int(value)
+
+
+def get_month_starts(from_date: int, to_date: int) -> list[int]:
+    """
+    Returns the first day of each month between two dates, as date_int.
+    """
+    month = (EPOCH + datetime.timedelta(days=from_date)).replace(day=1)
+    month_starts = []
+    while to_date_int(month) <= to_date:
+        month_starts.append(to_date_int(month))
+        month = (month + datetime.timedelta(days=32)).replace(day=1)
+    return month_starts
+
+
+class DiaryChange:
+    """
+    A change of a food diary entry since the last sync.
+
+    Attributes:
+        kind (str): "new", "changed" or "deleted".
+        date_int (int): The day of the entry.
+        food_entry_id (str): The ID of the entry.
+        entry (dict): The entry as returned by `food_entries_get_v2`, None for deleted entries.
+    """
+
+    __slots__ = ('kind', 'date_int', 'food_entry_id', 'entry')
+
+    def __init__(self, kind: str, date_int: int, food_entry_id: str, entry: dict = None) -> None:
+        self.kind = kind
+        self.date_int = date_int
+        self.food_entry_id = food_entry_id
+        self.entry = entry
+
+    def __repr__(self) -> str:
+        return f"DiaryChange(kind={self.kind!r}, date_int={self.date_int!r}, food_entry_id={self.food_entry_id!r})"
+
+
+class _DiaryCheckpoint:
+    """
+    SQLite tables of the synced day summaries and entries of each user.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS diary_days (
+            user TEXT, date_int INTEGER, summary TEXT, PRIMARY KEY (user, date_int))''')
+        self.connection.execute('''CREATE TABLE IF NOT EXISTS diary_entries (
+            user TEXT, date_int INTEGER, food_entry_id TEXT, fingerprint TEXT,
+            PRIMARY KEY (user, date_int, food_entry_id))''')
+
+    def get_days(self, user: str, from_date: int, to_date: int) -> dict:
+        return dict(self.connection.execute(
+            'SELECT date_int, summary FROM diary_days WHERE user = ? AND date_int BETWEEN ? AND ?',
+            (user, from_date, to_date)))
+
+    def get_entries(self, user: str, date_int: int) -> dict:
+        return dict(self.connection.execute(
+            'SELECT food_entry_id, fingerprint FROM diary_entries WHERE user = ? AND date_int = ?',
+            (user, date_int)))
+
+    def set_day(self, user: str, date_int: int, summary: str, entries: dict) -> None:
+        """
+        Replaces the summary and the entries of a day; a day without summary is removed.
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM diary_entries WHERE user = ? AND date_int = ?', (user, date_int))
+            self.connection.execute('DELETE FROM diary_days WHERE user = ? AND date_int = ?', (user, date_int))
+            if summary is not None:
+                self.connection.execute('INSERT INTO diary_days VALUES (?, ?, ?)', (user, date_int, summary))
+            self.connection.executemany('INSERT INTO diary_entries VALUES (?, ?, ?, ?)',
+                                        [(user, date_int, food_entry_id, fingerprint)
+                                         for food_entry_id, fingerprint in entries.items()])
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class DiarySync:
+    """
+    Incremental sync of a food diary.
+
+    The month summaries of the date range are fetched concurrently with
+    `food_entries_get_month_v2` and compared with those of the last sync, stored in the
+    checkpoint. Only the days whose summary changed are fetched with `food_entries_get_v2`,
+    and their entries are compared with the stored ones. Changes to entries that leave the
+    daily totals unchanged are therefore not noticed.
+
+    Example:
+        |   sync = DiarySync(fatsecret.profile_food_diary, 'diary-sync.db', user=user_id)
+        |   for change in sync.sync(date(2024, 1, 1), date.today()):
+        |       ...
+    """
+
+    def __init__(self, diary, checkpoint_path: str, user: str = '', max_in_flight: int = 16) -> None:
+        """
+        Parameters:
+            diary (ProfileFoodDiary): The client of the user's food diary.
+            checkpoint_path (str): SQLite file to store the synced state in.
+            user (str, optional): Key of the user in the checkpoint, if it holds several users.
+            max_in_flight (int, optional): Maximum number of days being fetched at once.
+        """
+        self.diary = diary
+        self.checkpoint_path = checkpoint_path
+        self.user = str(user)
+        self.max_in_flight = max_in_flight
+        # Exceptions by ('month', first day of the month) or ('day', date_int).
+        self.errors = {}
+
+    def _get_summaries(self, from_date: int, to_date: int) -> dict:
+        """
+        Returns the summary of each day with entries in the range. Days of months whose summary
+        couldn't be fetched are missing and recorded in `errors`.
+        """
+        futures = {month_start: self.diary.submit(self.diary.food_entries_get_month_v2, month_start)
+                   for month_start in get_month_starts(from_date, to_date)}
+        wait(futures.values())
+        summaries = {}
+        for month_start, future in futures.items():
+            if future.exception() is not None:
+                self.errors[('month', month_start)] = future.exception()
+                continue
+            for day in as_list((future.result().get('month') or {}).get('day')):
+                date_int = int(day['date_int'])
+                if from_date <= date_int <= to_date:
+                    summaries[date_int] = json.dumps(day, sort_keys=True)
+        return summaries
+
+    def _fetch_day(self, date_int: int) -> list:
+        response = self.diary.food_entries_get_v2(date=date_int, food_entry_id=None)
+        return as_list((response.get('food_entries') or {}).get('food_entry'))
+
+    def sync(self, from_date, to_date):
+        """
+        Syncs the diary between two dates, both included. The checkpoint of a day is updated
+        once all of its changes were consumed, so an interrupted sync yields them again.
+
+        Parameters:
+            from_date (datetime.date or int): First day, or number of days since January 1, 1970.
+            to_date (datetime.date or int): Last day, or number of days since January 1, 1970.
+
+        Yields:
+            DiaryChange: The new, changed and deleted entries, day by day as the days are fetched.
+            Months and days that couldn't be fetched are in `errors`, keyed by ('month', first day)
+            and ('day', date_int), and are synced next time. Called from a thread of the client's
+            executor, e.g. in a batch, the months and days are fetched one after the other.
+        """
+        from_date, to_date = to_date_int(from_date), to_date_int(to_date)
+        self.errors = {}
+        checkpoint = _DiaryCheckpoint(self.checkpoint_path)
+        pending = {}
+        try:
+            summaries = self._get_summaries(from_date, to_date)
+            stored_summaries = checkpoint.get_days(self.user, from_date, to_date)
+            failed_months = {date_int for kind, date_int in self.errors if kind == 'month'}
+            changed_days = sorted(
+                date_int for date_int in set(summaries) | set(stored_summaries)
+                if summaries.get(date_int) != stored_summaries.get(date_int)
+                and to_date_int((EPOCH + datetime.timedelta(days=date_int)).replace(day=1)) not in failed_months)
+
+            for date_int in changed_days:
+                pending[self.diary.submit(self._fetch_day, date_int)] = date_int
+                if len(pending) >= self.max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._finish(done, pending, summaries, checkpoint)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._finish(done, pending, summaries, checkpoint)
+        finally:
+            for future in pending:
+                future.cancel()
+            checkpoint.close()
+
+    def _finish(self, futures, pending: dict, summaries: dict, checkpoint: _DiaryCheckpoint):
+        for future in futures:
+            date_int = pending.pop(future)
+            if future.exception() is not None:
+                self.errors[('day', date_int)] = future.exception()
+                continue
+            stored_entries = checkpoint.get_entries(self.user, date_int)
+            entries = {}
+            for entry in future.result():
+                food_entry_id = str(entry['food_entry_id'])
+                entries[food_entry_id] = json.dumps(entry, sort_keys=True)
+                if food_entry_id not in stored_entries:
+                    yield DiaryChange('new', date_int, food_entry_id, entry)
+                elif stored_entries[food_entry_id] != entries[food_entry_id]:
+                    yield DiaryChange('changed', date_int, food_entry_id, entry)
+            for food_entry_id in sorted(stored_entries.keys() - entries.keys()):
+                yield DiaryChange('deleted', date_int, food_entry_id)
+            checkpoint.set_day(self.user, date_int, summaries.get(date_int), entries)
@@ -0,0 +1,133 @@
+"""
+Module `errors.py` maps the error responses of the FatSecret API to exceptions.
+See https://platform.fatsecret.com/docs/guides/error-codes
+"""
+
+
+class FatsecretError(Exception):
+    """
+    Error returned by the FatSecret API.
+
+    Attributes:
+        code (int): FatSecret error code, None if the error has no code.
+        message (str): Error message.
+        method (str): The API method that failed.
+        retryable (bool): Whether the same call may succeed when it is sent again.
+    """
+
+    retryable = False
+
+    def __init__(self, code: int, message: str, method: str = None) -> None:
+        text = message if code is None else f"[{code}] {message}"
+        super().__init__(f"{method}: {text}" if method else text)
+        self.code = code
+        self.message = message
+        self.method = method
+
+
+class FatsecretServerError(FatsecretError):
+    """
+    Unknown or temporary error on the side of FatSecret, e.g. code 1 or an HTTP 5xx response.
+    """
+
+    retryable = True
+
+
+class FatsecretAuthError(FatsecretError):
+    """
+    OAuth error, e.g. invalid credentials or an invalid or expired access token.
+    """
+
+
+class FatsecretInvalidTokenError(FatsecretAuthError):
+    """
+    The access token was rejected. The call can be sent again with a new token.
+    """
+
+    retryable = True
+
+
+class FatsecretRateLimitError(FatsecretError):
+    """
+    Too many calls were made. The call was not processed and can be sent again later.
+    """
+
+    retryable = True
+
+
+class FatsecretParameterError(FatsecretError):
+    """
+    A parameter of the call is missing or invalid (codes 101-199).
+    """
+
+
+class FatsecretApplicationError(FatsecretError):
+    """
+    The call was valid but could not be processed, e.g. an unknown profile (codes 200 and above).
+    """
+
+
+def get_error_class(code: int) -> type:
+    """
+    Returns the exception class for a FatSecret error code.
+    """
+    if code == 1:
+        return FatsecretServerError
+    if code in (9, 13):
+        return FatsecretInvalidTokenError
+    if 2 <= code <= 8 or code == 14:
+        return FatsecretAuthError
+    if code == 12:
+        return FatsecretRateLimitError
+    if 101 <= code <= 199:
+        return FatsecretParameterError
+    if code >= 200:
+        return FatsecretApplicationError
+    return FatsecretError
+
+
+def check_response(method: str, status_code: int, data) -> None:
+    """
+    Raises the matching exception if the response is an error.
+
+    Parameters:
+        method (str): The API method that was called.
+        status_code (int): HTTP status code of the response.
+        data: The decoded JSON response, None if it could not be decoded.
+
+    Raises:
+        FatsecretError: when the response contains an error or has an error status.
+    """
+    error = data.get('error') if isinstance(data, dict) else None
+    if isinstance(error, dict):
+        try:
+            code = int(error.get('code'))
+        except (TypeError, ValueError):
+            code = None
+        error_class = FatsecretError if code is None else get_error_class(code)
+        raise error_class(code, error.get('message'), method)
+    if status_code >= 500:
+        raise FatsecretServerError(None, f"HTTP {status_code}", method)
+    if status_code >= 400 or data is None:
+        raise FatsecretError(None, f"HTTP {status_code}", method)
+
+
+def check_token_response(status_code: int, data) -> None:
+    """
+    Raises the matching exception if a response of the token endpoint contains no token.
+
+    Parameters:
+        status_code (int): HTTP status code of the response.
+        data: The decoded JSON response, None if it could not be decoded.
+
+    Raises:
+        FatsecretError: when no access token was returned.
+    """
+    if isinstance(data, dict) and 'access_token' in data:
+        return
+    if status_code >= 500:
+        raise FatsecretServerError(None, f"HTTP {status_code}", 'token')
+    message = None
+    if isinstance(data, dict):
+        message = data.get('error_description') or data.get('error')
+    raise FatsecretAuthError(None, message or f"HTTP {status_code}", 'token')
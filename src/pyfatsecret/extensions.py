@@ -0,0 +1,331 @@
+"""
+Module `extensions.py` contains hand-written methods of the generated classes.
+The generated classes inherit them, see the 'extension' key of the module information in `autogen.py`.
+"""
+from concurrent.futures import wait
+from pyfatsecret.batch import BatchResult, is_executor_thread
+from pyfatsecret.utils import as_list
+
+
+def interleave(results_by_locale: dict) -> list:
+    """
+    Ranking policy that takes the foods of the locales in turns: the first food of every
+    locale, then the second food of every locale, and so on.
+    """
+    merged = []
+    result_lists = list(results_by_locale.values())
+    for position in range(max(map(len, result_lists), default=0)):
+        merged += [results[position]
+                   for results in result_lists if position < len(results)]
+    return merged
+
+
+def locale_order(results_by_locale: dict) -> list:
+    """
+    Ranking policy that keeps all foods of the first locale, followed by those of the second, and so on.
+    """
+    return [food for results in results_by_locale.values() for food in results]
+
+
+def best_rank(results_by_locale: dict) -> list:
+    """
+    Ranking policy that orders the foods by their best position in any locale. Foods that
+    are found in more locales come first among foods with the same position.
+    """
+    ranks = {}
+    for results in results_by_locale.values():
+        for position, food in enumerate(results):
+            best_position, count, first_food = ranks.get(
+                food.get('food_id'), (position, 0, food))
+            ranks[food.get('food_id')] = (
+                min(best_position, position), count + 1, first_food)
+    return [food for _, _, food in sorted(ranks.values(), key=lambda rank: (rank[0], -rank[1]))]
+
+
+RANKING_POLICIES = {
+    'interleave': interleave,
+    'locale_order': locale_order,
+    'best_rank': best_rank,
+}
+
+
+class MultiLocaleSearchResult:
+    """
+    Merged result of a search in several locales.
+
+    Attributes:
+        foods (list[dict]): The merged foods without duplicates, ordered by the ranking policy.
+        results_by_locale (dict): Foods of each locale that answered, keyed by (region, language).
+        sources (dict): The locales in which each food_id was found.
+        errors (dict): Exceptions of the locales whose search failed.
+        timed_out (list): Locales that didn't answer before the deadline.
+    """
+
+    def __init__(self, foods: list, results_by_locale: dict, sources: dict, errors: dict, timed_out: list) -> None:
+        self.foods = foods
+        self.results_by_locale = results_by_locale
+        self.sources = sources
+        self.errors = errors
+        self.timed_out = timed_out
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether the search succeeded in all locales.
+        """
+        return not self.errors and not self.timed_out
+
+
+def get_ranking_policy(ranking):
+    """
+    Returns the ranking policy with the given name, or `ranking` itself if it is a function.
+
+    Raises:
+        ValueError: when `ranking` is neither the name of a policy nor callable.
+    """
+    if callable(ranking):
+        return ranking
+    if ranking not in RANKING_POLICIES:
+        raise ValueError(f"Unknown ranking policy '{ranking}', expected one of "
+                         f"{', '.join(RANKING_POLICIES)} or a function")
+    return RANKING_POLICIES[ranking]
+
+
+def get_locales(locales) -> list[tuple]:
+    """
+    Returns the locales as (region, language) pairs; a region alone has no language.
+    """
+    return [(locale, None) if isinstance(locale, str) else tuple(locale) for locale in locales]
+
+
+def get_search_foods(response: dict) -> list:
+    """
+    Returns the foods of a response of `foods_search_v3`.
+    """
+    page_data = response.get('foods_search') or {}
+    return as_list((page_data.get('results') or {}).get('food'))
+
+
+def merge_locale_results(results_by_locale: dict, errors: dict, timed_out: list, ranking) -> MultiLocaleSearchResult:
+    """
+    Merges the foods found in each locale in the order of the ranking policy, without duplicates.
+    """
+    sources = {}
+    for locale, results in results_by_locale.items():
+        for food in results:
+            sources.setdefault(food.get('food_id'), []).append(locale)
+    foods, seen = [], set()
+    for food in ranking(results_by_locale):
+        if food.get('food_id') not in seen:
+            seen.add(food.get('food_id'))
+            foods.append(food)
+    return MultiLocaleSearchResult(foods, results_by_locale, sources, errors, timed_out)
+
+
+class ClientExtensions:
+    """
+    Helpers shared by the extensions. They use the methods of `FatsecretBase`.
+    """
+
+    def _iterate_pages(self, fetch_page, get_page_data, get_items, max_results: int, prefetch: int = 0,
+                       max_items: int = None):
+        """
+        Yields the items of all pages of a paginated search.
+
+        Parameters:
+            fetch_page (Callable[[int], dict]): Fetches the page with the given zero-based number.
+            get_page_data (Callable[[dict], dict]): Returns the part of a response that holds
+                'total_results' and the items.
+            get_items (Callable[[dict], Any]): Returns the items of the page data.
+            max_results (int): Number of items per page.
+            prefetch (int, optional): Number of following pages to fetch concurrently while the
+                items of the current page are consumed.
+            max_items (int, optional): Stop after this many items.
+        """
+        if is_executor_thread(self.executor):
+            # Prefetched pages would be fetched right away, before they are needed.
+            prefetch = 0
+        first_page = fetch_page(0)
+        total = int(get_page_data(first_page).get('total_results', 0))
+        if max_items is not None:
+            total = min(total, max_items)
+        page_count = -(-total // max_results)
+
+        pending = {}
+        next_page_to_submit = 1
+        count = 0
+        try:
+            for page_number in range(page_count):
+                next_page_to_submit = max(next_page_to_submit, page_number + 1)
+                while next_page_to_submit < min(page_count, page_number + prefetch + 1):
+                    pending[next_page_to_submit] = self.submit(
+                        fetch_page, next_page_to_submit)
+                    next_page_to_submit += 1
+
+                if page_number == 0:
+                    page = first_page
+                elif page_number in pending:
+                    page = pending.pop(page_number).result()
+                else:
+                    page = fetch_page(page_number)
+
+                items = as_list(get_items(get_page_data(page)))
+                if not items:
+                    return
+                for item in items:
+                    if count >= total:
+                        return
+                    yield item
+                    count += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+
+class FoodsExtensions(ClientExtensions):
+    """
+    Hand-written methods of `Foods`.
+    """
+
+    def iter_foods_search_v3(self, search_expression=None, max_results=50, prefetch=0, max_items=None,
+                             **kwargs):
+        """
+        Iterates lazily over all foods found by `foods_search_v3`, fetching the pages as needed.
+
+        Only the current page and the prefetched pages are held in memory. Called from a thread
+        of the client's executor, e.g. in a batch, no pages are prefetched.
+
+        Args:
+            search_expression (String, optional): Search expression to match on food names
+            max_results (Int, optional): Number of foods per page, at most 50
+            prefetch (Int, optional): Number of following pages to fetch concurrently
+            max_items (Int, optional): Maximum number of foods to yield
+            **kwargs: Other parameters of `foods_search_v3`, e.g. region or language
+
+        Yields:
+            dict: The foods, in the order of the search results.
+        """
+        return self._iterate_pages(
+            lambda page_number: self.foods_search_v3(search_expression=search_expression,
+                                                     page_number=page_number, max_results=max_results, **kwargs),
+            lambda response: response.get('foods_search') or {},
+            lambda page_data: (page_data.get('results') or {}).get('food'),
+            max_results, prefetch, max_items)
+
+    def foods_search_locales(self, search_expression, locales, deadline=None, ranking='interleave', max_results=None,
+                             **kwargs) -> MultiLocaleSearchResult:
+        """
+        Searches foods in several locales concurrently with `foods_search_v3` and merges the results.
+
+        Foods are deduplicated by food_id. If some locales don't answer before the deadline, the
+        results of the others are returned; their searches keep running in the background.
+        Called from a thread of the client's executor, e.g. in a batch, the locales are searched
+        one after the other and the deadline doesn't apply.
+
+        Args:
+            search_expression (String): Search expression to match on food names
+            locales (Iterable): Regions like "FR" or (region, language) pairs like ("FR", "fr")
+            deadline (Float, optional): Seconds to wait for the searches, None waits for all
+            ranking (String or Callable, optional): "interleave", "locale_order", "best_rank" or a
+                function that gets the foods per locale and returns them in the merged order
+            max_results (Int, optional): Maximum number of results per locale, at most 50
+            **kwargs: Other parameters of `foods_search_v3`
+
+        Raises:
+            ValueError: when the ranking is not a known policy or a function.
+
+        Returns:
+            MultiLocaleSearchResult: The merged foods and the state of each locale.
+        """
+        ranking = get_ranking_policy(ranking)
+        locales = get_locales(locales)
+        futures = {locale: self.submit(self.foods_search_v3, search_expression=search_expression,
+                                       max_results=max_results, region=locale[0], language=locale[1], **kwargs)
+                   for locale in locales}
+        wait(futures.values(), timeout=deadline)
+
+        results_by_locale, errors, timed_out = {}, {}, []
+        for locale, future in futures.items():
+            if not future.done():
+                future.cancel()
+                timed_out.append(locale)
+            elif future.exception() is not None:
+                errors[locale] = future.exception()
+            else:
+                results_by_locale[locale] = get_search_foods(future.result())
+        return merge_locale_results(results_by_locale, errors, timed_out, ranking)
+
+    def get_many(self, food_ids, include_sub_categories=None, flag_default_serving=None, region=None,
+                 language=None, **kwargs) -> list[BatchResult]:
+        """
+        Returns the details of many foods, like calling `food_get_v4` for each of them.
+
+        Duplicate IDs are fetched once. Foods in the client's cache are returned right away and
+        the others are fetched concurrently on the client's executor, or one after the other
+        when called from a thread of that executor, e.g. in a batch.
+
+        Args:
+            food_ids (Iterable): Food IDs
+            include_sub_categories (Boolean, optional): Response will include the names of all sub categories associated with the food
+            flag_default_serving (Boolean, optional): The response will flag one of the servings as the default serving
+            region (String, optional): Results will be filtered by region. E.G.: "FR" returns results from France
+            language (String, optional): (Ignored unless region is also specified) Results will be in the specified language
+            **kwargs: Other parameters of `food_get_v4`
+
+        Returns:
+            list[BatchResult]: One result per given ID, in the same order, holding either the
+            response of `food_get_v4` or the exception of its call.
+        """
+        food_ids = [str(food_id) for food_id in food_ids]
+        results = {}
+        futures = {}
+        for food_id in dict.fromkeys(food_ids):
+            params = self.get_params(food_id=food_id, include_sub_categories=include_sub_categories,
+                                     flag_default_serving=flag_default_serving, region=region, language=language,
+                                     **kwargs)
+            params['method'] = 'food.get.v4'
+            params['format'] = 'json'
+            cached_response = self._get_cached_response('food.get.v4', params)
+            if cached_response is not None:
+                results[food_id] = BatchResult(value=cached_response)
+            else:
+                # The cache was just looked into, so the miss is sent without looking again.
+                futures[food_id] = self.submit(
+                    self._send_request_once, 'food.get.v4', params)
+        for food_id, future in futures.items():
+            try:
+                results[food_id] = BatchResult(value=future.result())
+            except Exception as error:
+                results[food_id] = BatchResult(error=error)
+        return [results[food_id] for food_id in food_ids]
+
+
+class RecipesExtensions(ClientExtensions):
+    """
+    Hand-written methods of `Recipes`.
+    """
+
+    def iter_recipes_search_v3(self, search_expression=None, max_results=50, prefetch=0, max_items=None,
+                               **kwargs):
+        """
+        Iterates lazily over all recipes found by `recipes_search_v3`, fetching the pages as needed.
+
+        Only the current page and the prefetched pages are held in memory. Called from a thread
+        of the client's executor, e.g. in a batch, no pages are prefetched.
+
+        Args:
+            search_expression (String, optional): Search expression to match on recipe names
+            max_results (Int, optional): Number of recipes per page, at most 50
+            prefetch (Int, optional): Number of following pages to fetch concurrently
+            max_items (Int, optional): Maximum number of recipes to yield
+            **kwargs: Other parameters of `recipes_search_v3`, e.g. recipe_types or region
+
+        Yields:
+            dict: The recipes, in the order of the search results.
+        """
+        return self._iterate_pages(
+            lambda page_number: self.recipes_search_v3(search_expression=search_expression,
+                                                       page_number=page_number, max_results=max_results, **kwargs),
+            lambda response: response.get('recipes') or {},
+            lambda page_data: page_data.get('recipe'),
+            max_results, prefetch, max_items)
@@ -0,0 +1,168 @@
+from concurrent.futures import ThreadPoolExecutor
+from pyfatsecret.async_token_manager import AsyncTokenManager
+from pyfatsecret.async_transport import AsyncTransport
+from pyfatsecret.batch import Batch
+from pyfatsecret.cache import ResponseCache
+from pyfatsecret.rate_limiter import RateLimiter
+from pyfatsecret.retry import RetryPolicy
+from pyfatsecret.single_flight import SingleFlight, AsyncSingleFlight
+from pyfatsecret.token_manager import TokenManager
+from pyfatsecret.token_store import TokenStore
+from pyfatsecret.transport import Transport
+
+
+class FatsecretFacade:
+    """
+    Base class of the generated `Fatsecret` class.
+
+    It creates the state that all sub-clients share, so that e.g. the access token
+    is requested and refreshed only once per set of credentials.
+    """
+
+    def __init__(self, client_id: str, client_secret: str, lazy: bool = False, warm_up: bool = False,
+                 renew_in_background: bool = False, token_store: TokenStore = None, pool_maxsize: int = 10,
+                 connect_timeout: float = 5.0, read_timeout: float = 30.0, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, cache: ResponseCache = None,
+                 coalesce_requests: bool = True, json_loads=None) -> None:
+        """
+        Initializes the shared state for the given client credentials.
+
+        Parameters:
+            client_id (str): Your FatSecret application client ID.
+            client_secret (str): Your FatSecret application client secret key.
+            lazy (bool, optional): Don't do any network I/O here; the access token is
+                requested on the first API call.
+            warm_up (bool, optional): With `lazy`, request the access token on a background
+                thread so that the first API call doesn't have to wait for it.
+            renew_in_background (bool, optional): Renew the access token on a background thread
+                before it expires, so that API calls never wait for the token endpoint.
+            token_store (TokenStore, optional): Store to share the access token with other
+                processes, e.g. `FileTokenStore` or `SQLiteTokenStore`.
+            pool_maxsize (int, optional): Maximum number of keep-alive connections per host.
+            connect_timeout (float, optional): Seconds to wait for a connection to be established.
+            read_timeout (float, optional): Seconds to wait for the server to send a response.
+            rate_limiter (RateLimiter, optional): Rate limiter for the calls of all sub-clients.
+            retry_policy (RetryPolicy, optional): Policy for sending failed calls again.
+                Defaults to `RetryPolicy()`.
+            cache (ResponseCache, optional): Cache for responses of read methods, e.g. `MemoryCache()`.
+            coalesce_requests (bool, optional): Send identical calls of read methods that are in
+                flight at the same time only once.
+            json_loads (Callable[[bytes], Any], optional): Decoder of the response bodies. Defaults to
+                orjson if it is installed, else the standard library.
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce_requests else False
+        self.transport = Transport(pool_maxsize=pool_maxsize, connect_timeout=connect_timeout,
+                                   read_timeout=read_timeout)
+        # Threads are only started on use; one per pooled connection.
+        self.executor = ThreadPoolExecutor(
+            max_workers=pool_maxsize, thread_name_prefix='pyfatsecret')
+        self.token_manager = TokenManager(client_id, client_secret, lazy=lazy, warm_up=warm_up,
+                                          transport=self.transport, renew_in_background=renew_in_background,
+                                          token_store=token_store)
+        self.client_kwargs = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'token_manager': self.token_manager,
+            'transport': self.transport,
+            'rate_limiter': self.rate_limiter,
+            'retry_policy': self.retry_policy,
+            'executor': self.executor,
+            'cache': self.cache,
+            'single_flight': self.single_flight,
+            'json_loads': json_loads,
+        }
+
+    def batch(self) -> Batch:
+        """
+        Creates a batch that runs API calls of any sub-client concurrently on the shared
+        thread pool, which has one thread per pooled connection.
+
+        Returns:
+            Batch: The batch. Calls are run by `Batch.execute` or at the end of a `with` block.
+        """
+        return Batch(self.executor)
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections of all sub-clients and stops the background token
+        renewal and the shared thread pool.
+        """
+        self.token_manager.stop()
+        self.executor.shutdown(wait=False)
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncFatsecretFacade:
+    """
+    Base class of the generated `AsyncFatsecret` class.
+
+    All async sub-clients share one token manager and one async connection pool.
+    """
+
+    def __init__(self, client_id: str, client_secret: str, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, connect_timeout: float = 5.0, read_timeout: float = 30.0,
+                 request_timeout: float = None, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, cache: ResponseCache = None,
+                 coalesce_requests: bool = True, json_loads=None) -> None:
+        """
+        Initializes the shared state for the given client credentials. No I/O is done here.
+
+        Parameters:
+            client_id (str): Your FatSecret application client ID.
+            client_secret (str): Your FatSecret application client secret key.
+            max_connections (int, optional): Maximum number of concurrent connections.
+            max_keepalive_connections (int, optional): Maximum number of idle connections kept alive.
+            connect_timeout (float, optional): Seconds to wait for a connection to be established.
+            read_timeout (float, optional): Seconds to wait for the server to send a response.
+            request_timeout (float, optional): Default limit in seconds for a single API call.
+            rate_limiter (RateLimiter, optional): Rate limiter for the calls of all sub-clients.
+            retry_policy (RetryPolicy, optional): Policy for sending failed calls again.
+                Defaults to `RetryPolicy()`.
+            cache (ResponseCache, optional): Cache for responses of read methods, e.g. `MemoryCache()`.
+            coalesce_requests (bool, optional): Send identical calls of read methods that are in
+                flight at the same time only once.
+            json_loads (Callable[[bytes], Any], optional): Decoder of the response bodies. Defaults to
+                orjson if it is installed, else the standard library.
+        """
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.cache = cache
+        self.single_flight = AsyncSingleFlight() if coalesce_requests else False
+        self.transport = AsyncTransport(max_connections=max_connections,
+                                        max_keepalive_connections=max_keepalive_connections,
+                                        connect_timeout=connect_timeout, read_timeout=read_timeout)
+        self.token_manager = AsyncTokenManager(
+            client_id, client_secret, transport=self.transport)
+        self.client_kwargs = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'token_manager': self.token_manager,
+            'transport': self.transport,
+            'request_timeout': request_timeout,
+            'rate_limiter': self.rate_limiter,
+            'retry_policy': self.retry_policy,
+            'cache': self.cache,
+            'single_flight': self.single_flight,
+            'json_loads': json_loads,
+        }
+
+    async def close(self) -> None:
+        """
+        Closes the pooled connections of all sub-clients.
+        """
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -1,3 +1,4 @@
+from pyfatsecret.facade import FatsecretFacade
 from pyfatsecret.foods import Foods
 from pyfatsecret.recipes import Recipes
 from pyfatsecret.profile_foods import ProfileFoods
@@ -9,10 +10,11 @@ from pyfatsecret.profile_exercise_diary import ProfileExerciseDiary
 from pyfatsecret.profile_weight_diary import ProfileWeightDiary
 
 
-class Fatsecret:
+class Fatsecret(FatsecretFacade):
 
-    def __init__(self, client_id: str, client_secret: str) -> None:
-        kwargs = {'client_id': client_id, 'client_secret': client_secret}
+    def __init__(self, client_id: str, client_secret: str, **kwargs) -> None:
+        super().__init__(client_id, client_secret, **kwargs)
+        kwargs = self.client_kwargs
         self.foods = Foods(**kwargs)
         self.recipes = Recipes(**kwargs)
         self.profile_foods = ProfileFoods(**kwargs)
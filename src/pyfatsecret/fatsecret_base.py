@@ -1,5 +1,14 @@
-import requests
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pyfatsecret.batch import submit
+from pyfatsecret.cache import get_cache_key
+from pyfatsecret.decoding import loads
+from pyfatsecret.errors import check_response, FatsecretInvalidTokenError
+from pyfatsecret.methods import is_read_method
+from pyfatsecret.retry import RetryPolicy
+from pyfatsecret.single_flight import SingleFlight
+from pyfatsecret.token_manager import TokenManager
+from pyfatsecret.transport import Transport
 
 
 class FatsecretBase:
@@ -11,7 +20,7 @@ class FatsecretBase:
     with the necessary authorization headers.
     """
 
-    TOKEN_URL = "https://oauth.fatsecret.com/connect/token"
+    TOKEN_URL = TokenManager.TOKEN_URL
     API_URL = "https://platform.fatsecret.com/rest/server.api"
 
     def __init__(self, **kwargs) -> None:
@@ -21,11 +30,39 @@ class FatsecretBase:
         Parameters:
             client_id (str): Your FatSecret application client ID.
             client_secret (str): Your FatSecret application client secret key.
+            token_manager (TokenManager, optional): Token manager shared with other clients.
+                A new one is created from the credentials if it is not given.
+            lazy (bool, optional): Don't request a token before the first API call.
+            warm_up (bool, optional): With `lazy`, request the first token on a background thread.
+            renew_in_background (bool, optional): Renew the token on a background thread before it expires.
+            token_store (TokenStore, optional): Store to share the token with other processes.
+            transport (Transport, optional): Pooled HTTP transport shared with other clients.
+                A new one is created if it is not given.
+            rate_limiter (RateLimiter, optional): Rate limiter shared with other clients.
+            retry_policy (RetryPolicy, optional): Policy for sending failed calls again.
+                Defaults to `RetryPolicy()`.
+            executor (ThreadPoolExecutor, optional): Thread pool for concurrent calls, shared
+                with other clients. A pool with one thread per pooled connection is created
+                on first use if it is not given.
+            cache (ResponseCache, optional): Cache for responses of read methods, shared with other clients.
+            single_flight (SingleFlight, optional): Coalesces identical calls of read methods that are
+                in flight at the same time, shared with other clients. Pass False to send every call.
+            json_loads (Callable[[bytes], Any], optional): Decoder of the response bodies. Defaults to
+                `decoding.loads`, which uses orjson if it is installed.
         """
         self.client_id = kwargs['client_id']
         self.client_secret = kwargs['client_secret']
-        self._time_token_was_requested = time.time()
-        self._access_token_data = self.get_new_access_token()
+        self.transport = kwargs.get('transport') or Transport()
+        self.rate_limiter = kwargs.get('rate_limiter')
+        self.retry_policy = kwargs.get('retry_policy') or RetryPolicy()
+        self._executor = kwargs.get('executor')
+        self.cache = kwargs.get('cache')
+        self.single_flight = kwargs.get('single_flight', SingleFlight())
+        self.json_loads = kwargs.get('json_loads') or loads
+        self.token_manager = kwargs.get('token_manager') or TokenManager(
+            self.client_id, self.client_secret, lazy=kwargs.get('lazy', False), warm_up=kwargs.get('warm_up', False),
+            transport=self.transport, renew_in_background=kwargs.get('renew_in_background', False),
+            token_store=kwargs.get('token_store'))
 
     def get_new_access_token(self) -> dict:
         """
@@ -34,11 +71,7 @@ class FatsecretBase:
         Returns:
             dict: A dictionary containing the access token and other data.
         """
-        data = {'grant_type': 'client_credentials'}
-        self._time_token_was_requested = time.time()
-        response = requests.post(self.TOKEN_URL, data=data,
-                                 auth=(self.client_id, self.client_secret))
-        return response.json()
+        return self.token_manager.get_new_access_token()
 
     @property
     def access_token(self):
@@ -48,10 +81,7 @@ class FatsecretBase:
         Returns:
             str: The access token.
         """
-        if self.access_token_expires_in < 600:
-            self._access_token_data = self.get_new_access_token()
-
-        return self._access_token_data.get('access_token')
+        return self.token_manager.access_token
 
     @property
     def access_token_expires_in(self) -> float:
@@ -61,7 +91,30 @@ class FatsecretBase:
         Returns:
             float: The number of seconds until the access token expires.
         """
-        return self._access_token_data.get('expires_in') - (time.time() - self._time_token_was_requested)
+        return self.token_manager.access_token_expires_in
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool for running API calls concurrently.
+
+        Returns:
+            ThreadPoolExecutor: The thread pool.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.transport.pool_maxsize, thread_name_prefix='pyfatsecret')
+        return self._executor
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """
+        Runs a call on the executor, or right away when called from one of its threads, e.g.
+        from a call of a batch, so that nested fan-outs can't wait for each other forever.
+
+        Returns:
+            Future: The future of the call.
+        """
+        return submit(self.executor, func, *args, **kwargs)
 
     def get_params(self, **kwargs):
         params = {}
@@ -70,22 +123,127 @@ class FatsecretBase:
                 params[key] = value
         return params
 
+    def _get_timeout(self, start: float):
+        """
+        Returns the timeouts for the next attempt of a call that started at `start`,
+        so that it doesn't run past the deadline of the retry policy.
+        """
+        if self.retry_policy.deadline is None:
+            return None
+        remaining = self.retry_policy.deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            raise TimeoutError(
+                f"The deadline of {self.retry_policy.deadline} seconds has passed")
+        return tuple(min(timeout, remaining) for timeout in self.transport.timeout)
+
+    def _send_request(self, method: str, params: dict, timeout) -> dict:
+        """
+        Sends a single request and raises the matching `FatsecretError` if it failed.
+        """
+        access_token = self.access_token
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(method)
+        kwargs = {} if timeout is None else {'timeout': timeout}
+        response = self.transport.post(
+            self.API_URL, headers=headers, params=params, **kwargs)
+        try:
+            data = self.json_loads(response.content)
+        except ValueError:
+            data = None
+        try:
+            check_response(method, response.status_code, data)
+        except FatsecretInvalidTokenError:
+            self.token_manager.invalidate(access_token)
+            raise
+        if self.cache is not None:
+            self.cache.set(method, params, data, len(response.content))
+        return data
+
+    def _send_request_with_retries(self, method: str, params: dict) -> dict:
+        """
+        Sends a request and sends it again according to the retry policy if it failed.
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._send_request(method, params, self._get_timeout(start))
+            except Exception as error:
+                if attempt >= self.retry_policy.max_attempts or \
+                        not self.retry_policy.is_retryable(error, method, self.transport):
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+                if self.retry_policy.deadline is not None and \
+                        time.monotonic() - start + delay >= self.retry_policy.deadline:
+                    raise
+                time.sleep(delay)
+
+    def _revalidate(self, method: str, params: dict) -> None:
+        """
+        Fetches a fresh response for a stale cache entry. Errors are ignored since the
+        stale response has already been returned.
+        """
+        try:
+            self._send_request_with_retries(method, params)
+        except Exception:
+            pass
+
+    def _get_cached_response(self, method: str, params: dict):
+        """
+        Returns the cached response of a call, None if the client has no cache or the call
+        is not cached. A stale response is refreshed in the background.
+        """
+        if self.cache is None:
+            return None
+        cache_entry = self.cache.get_entry(method, params)
+        if cache_entry is None:
+            return None
+        cached_response, stale = cache_entry
+        if stale:
+            self.executor.submit(self._revalidate, method, params)
+        return cached_response
+
     def make_request(self, method: str, params: dict = None) -> dict:
         """
         Makes a request to the FatSecret API using the obtained access token.
 
+        Failed calls are sent again according to the retry policy of the client.
+        Responses of read methods are served from the cache of the client if it has one.
+        Stale cached responses are returned right away and refreshed in the background.
+        Identical calls of read methods that are in flight at the same time are sent only once;
+        all callers then get the same response object.
+
         Parameters:
             method (str): The API method to call.
             params (dict, optional): Additional parameters for the API request.
 
+        Raises:
+            FatsecretError: when the API returns an error, see `pyfatsecret.errors`.
+            requests.RequestException: when the request fails and can't be retried.
+            TimeoutError: when the deadline of the retry policy has passed.
+
         Returns:
             dict: The JSON response from the API.
         """
         if params is None:
             params = {}
-        headers = {'Authorization': f'Bearer {self.access_token}'}
         params['method'] = method
         params['format'] = 'json'
 
-        response = requests.post(self.API_URL, headers=headers, params=params)
-        return response.json()
+        cached_response = self._get_cached_response(method, params)
+        if cached_response is not None:
+            return cached_response
+        return self._send_request_once(method, params)
+
+    def _send_request_once(self, method: str, params: dict) -> dict:
+        """
+        Sends a request without looking into the cache. Identical calls of read methods
+        that are in flight at the same time are sent only once.
+        """
+        if self.single_flight and is_read_method(method):
+            return self.single_flight.do(get_cache_key(method, params),
+                                         lambda: self._send_request_with_retries(method, params))
+        return self._send_request_with_retries(method, params)
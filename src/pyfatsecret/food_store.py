@@ -0,0 +1,285 @@
+"""
+Module `food_store.py` packs foods and their servings into a binary file that worker processes
+open with `mmap`, so that the operating system's page cache holds the only copy of the data.
+
+Layout (little-endian):
+
+- header: magic, version, counts and the offsets of the sections,
+- index: open-addressing hash table of (food_id, food number + 1) slots,
+- foods: fixed-size records with the strings as numbers of the string table,
+- servings: fixed-size records with the numbers as float64, NaN when missing,
+- strings: offsets into the UTF-8 data of each distinct string, then the data.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from pyfatsecret.models import Food, NUTRIENTS
+
+MAGIC = b'PFFS'
+VERSION = 1
+NO_STRING = 0xFFFFFFFF
+NAN = float('nan')
+
+HEADER = struct.Struct('<4sIIIIIQQQQQ')
+INDEX_SLOT = struct.Struct('<qQ')
+FOOD_RECORD = struct.Struct('<qIIIII')
+SERVING_RECORD = struct.Struct(f'<qIIII{2 + len(NUTRIENTS)}d')
+STRING_OFFSET = struct.Struct('<Q')
+
+FOOD_STRING_FIELDS = ('food_name', 'food_type', 'brand_name')
+SERVING_STRING_FIELDS = ('serving_description', 'measurement_description', 'metric_serving_unit')
+SERVING_FLOAT_FIELDS = ('metric_serving_amount', 'number_of_units') + NUTRIENTS
+# Format and offset of each field of a serving record, to read single fields.
+SERVING_FIELD_FORMATS = ('<q', '<I', '<I', '<I', '<I') + ('<d',) * len(SERVING_FLOAT_FIELDS)
+SERVING_FIELD_OFFSETS = (0, 8, 12, 16, 20) + tuple(24 + 8 * position for position in range(len(SERVING_FLOAT_FIELDS)))
+
+
+def get_slot(food_id: int, mask: int) -> int:
+    return (food_id * 0x9E3779B97F4A7C15 >> 16) & mask
+
+
+def write_food_store(path: str, foods) -> int:
+    """
+    Writes foods into a store file. The file is replaced atomically, so that processes that
+    have the previous file open keep reading it until they open the new one.
+
+    Parameters:
+        path (str): Path of the store file.
+        foods (Iterable): Responses of `food_get_v4`, food dicts or `Food` models. Later foods
+            replace earlier ones with the same food_id.
+
+    Returns:
+        int: The number of foods written.
+    """
+    strings, string_numbers = [], {}
+
+    def add_string(value) -> int:
+        if value is None:
+            return NO_STRING
+        if value not in string_numbers:
+            string_numbers[value] = len(strings)
+            strings.append(value)
+        return string_numbers[value]
+
+    parsed_foods = {}
+    for food in foods:
+        if isinstance(food, dict):
+            food = Food.from_response(food) if 'food' in food else Food(food)
+        parsed_foods[food.food_id] = food
+
+    food_records, serving_records = [], []
+    for food_id, food in parsed_foods.items():
+        servings = food.servings
+        food_records.append(FOOD_RECORD.pack(food_id, *(add_string(getattr(food, field)) for field in FOOD_STRING_FIELDS),
+                                             len(serving_records), len(servings)))
+        for serving in servings:
+            serving_records.append(SERVING_RECORD.pack(
+                serving.serving_id if serving.serving_id is not None else -1,
+                *(add_string(getattr(serving, field)) for field in SERVING_STRING_FIELDS),
+                int(bool(serving.is_default)),
+                *(NAN if getattr(serving, field) is None else getattr(serving, field) for field in SERVING_FLOAT_FIELDS)))
+
+    capacity = 1
+    while capacity < 2 * len(food_records):
+        capacity *= 2
+    slots = [(0, 0)] * capacity
+    for number, food_id in enumerate(parsed_foods):
+        slot = get_slot(food_id, capacity - 1)
+        while slots[slot][1]:
+            slot = (slot + 1) & (capacity - 1)
+        slots[slot] = (food_id, number + 1)
+
+    encoded = [value.encode('utf-8') for value in strings]
+    string_offsets, position = [], 0
+    for value in encoded:
+        string_offsets.append(position)
+        position += len(value)
+    string_offsets.append(position)
+
+    index_offset = HEADER.size
+    foods_offset = index_offset + capacity * INDEX_SLOT.size
+    servings_offset = foods_offset + len(food_records) * FOOD_RECORD.size
+    strings_offset = servings_offset + len(serving_records) * SERVING_RECORD.size
+    string_data_offset = strings_offset + len(string_offsets) * STRING_OFFSET.size
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        with open(fd, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(food_records), len(serving_records), len(strings), capacity,
+                                   index_offset, foods_offset, servings_offset, strings_offset, string_data_offset))
+            file.writelines(INDEX_SLOT.pack(*slot) for slot in slots)
+            file.writelines(food_records)
+            file.writelines(serving_records)
+            file.writelines(STRING_OFFSET.pack(offset) for offset in string_offsets)
+            file.writelines(encoded)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(food_records)
+
+
+class StoredServing:
+    """
+    View of a serving in a `FoodStore`. The fields are read from the mapped file on access
+    and have the names of the `Serving` model.
+    """
+
+    __slots__ = ('_store', '_offset')
+    _FLOAT_POSITIONS = {field: 5 + position for position, field in enumerate(SERVING_FLOAT_FIELDS)}
+    _STRING_POSITIONS = {field: 1 + position for position, field in enumerate(SERVING_STRING_FIELDS)}
+
+    def __init__(self, store: 'FoodStore', offset: int) -> None:
+        self._store = store
+        self._offset = offset
+
+    def _read(self, position: int):
+        return struct.unpack_from(SERVING_FIELD_FORMATS[position], self._store._buffer,
+                                  self._offset + SERVING_FIELD_OFFSETS[position])[0]
+
+    @property
+    def serving_id(self) -> int:
+        serving_id = self._read(0)
+        return None if serving_id == -1 else serving_id
+
+    @property
+    def is_default(self) -> bool:
+        return bool(self._read(4))
+
+    def __getattr__(self, name: str):
+        if name in self._FLOAT_POSITIONS:
+            value = self._read(self._FLOAT_POSITIONS[name])
+            return None if value != value else value
+        if name in self._STRING_POSITIONS:
+            return self._store.get_string(self._read(self._STRING_POSITIONS[name]))
+        raise AttributeError(name)
+
+    def nutrients(self) -> dict:
+        """
+        Returns all nutrients of the serving, None for the missing ones.
+        """
+        values = SERVING_RECORD.unpack_from(self._store._buffer, self._offset)[7:]
+        return {nutrient: None if value != value else value for nutrient, value in zip(NUTRIENTS, values)}
+
+    def __repr__(self) -> str:
+        return f"StoredServing(serving_id={self.serving_id!r}, serving_description={self.serving_description!r})"
+
+
+class StoredFood:
+    """
+    View of a food in a `FoodStore`, with the attributes of the `Food` model that the store keeps.
+    """
+
+    __slots__ = ('_store', 'food_id', 'food_name', 'food_type', 'brand_name', '_first_serving', '_serving_count')
+
+    def __init__(self, store: 'FoodStore', offset: int) -> None:
+        food_id, name, food_type, brand, first_serving, serving_count = FOOD_RECORD.unpack_from(store._buffer, offset)
+        self._store = store
+        self.food_id = food_id
+        self.food_name = store.get_string(name)
+        self.food_type = store.get_string(food_type)
+        self.brand_name = store.get_string(brand)
+        self._first_serving = first_serving
+        self._serving_count = serving_count
+
+    @property
+    def servings(self) -> list[StoredServing]:
+        start = self._store._servings_offset + self._first_serving * SERVING_RECORD.size
+        return [StoredServing(self._store, start + number * SERVING_RECORD.size)
+                for number in range(self._serving_count)]
+
+    @property
+    def default_serving(self) -> StoredServing:
+        servings = self.servings
+        return next((serving for serving in servings if serving.is_default), servings[0] if servings else None)
+
+    def __repr__(self) -> str:
+        return f"StoredFood(food_id={self.food_id!r}, food_name={self.food_name!r})"
+
+
+class FoodStore:
+    """
+    Read-only access to a store file written by `write_food_store`.
+
+    The file is mapped into memory and records are read where they are, without loading or
+    deserializing the file; processes that open the same file share its pages. Foods are
+    found in constant time through the hash index.
+
+    Example:
+        |   write_food_store('foods.bin', (result.value for result in fatsecret.foods.get_many(food_ids) if result.ok))
+        |   store = FoodStore('foods.bin')
+        |   calories = store.get(33691).default_serving.calories
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Parameters:
+            path (str): Path of the store file.
+
+        Raises:
+            ValueError: when the file is not a store file of this version.
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self._food_count, self._serving_count, self._string_count, self._capacity,
+         self._index_offset, self._foods_offset, self._servings_offset, self._strings_offset,
+         self._string_data_offset) = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a food store of version {VERSION}")
+        self._strings = {}
+
+    def __len__(self) -> int:
+        return self._food_count
+
+    def __contains__(self, food_id) -> bool:
+        return self._find(int(food_id)) is not None
+
+    def _find(self, food_id: int):
+        """
+        Returns the number of the food record, None if the food is not in the store.
+        """
+        mask = self._capacity - 1
+        slot = get_slot(food_id, mask)
+        while True:
+            slot_food_id, number = INDEX_SLOT.unpack_from(self._buffer, self._index_offset + slot * INDEX_SLOT.size)
+            if not number:
+                return None
+            if slot_food_id == food_id:
+                return number - 1
+            slot = (slot + 1) & mask
+
+    def get_string(self, number: int):
+        if number == NO_STRING:
+            return None
+        value = self._strings.get(number)
+        if value is None:
+            start, end = struct.unpack_from('<QQ', self._buffer, self._strings_offset + number * STRING_OFFSET.size)
+            value = self._strings[number] = str(self._buffer[self._string_data_offset + start:
+                                                             self._string_data_offset + end], 'utf-8')
+        return value
+
+    def get(self, food_id):
+        """
+        Returns the food with the given ID, None if it is not in the store.
+        """
+        number = self._find(int(food_id))
+        if number is None:
+            return None
+        return StoredFood(self, self._foods_offset + number * FOOD_RECORD.size)
+
+    def __iter__(self):
+        for number in range(self._food_count):
+            yield StoredFood(self, self._foods_offset + number * FOOD_RECORD.size)
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
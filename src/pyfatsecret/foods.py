@@ -12,9 +12,10 @@ Module 'foods.py' contains the following methods:
 and was generated on 04.05.2024 15:55.
 """
 from pyfatsecret.fatsecret_base import FatsecretBase
+from pyfatsecret.extensions import FoodsExtensions
 
 
-class Foods(FatsecretBase):
+class Foods(FoodsExtensions, FatsecretBase):
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -0,0 +1,39 @@
+"""
+Module `methods.py` classifies the API methods of the generated modules.
+"""
+
+# Methods that only read data. Calling them again has no side effects, so they can
+# safely be retried, cached and coalesced.
+READ_METHODS = frozenset({
+    'food.find_id_for_barcode',
+    'food.get.v4',
+    'foods.autocomplete.v2',
+    'foods.search.v3',
+    'foods.search',
+    'food_brands.get.v2',
+    'food_categories.get.v2',
+    'food_sub_categories.get.v2',
+    'recipe.get.v2',
+    'recipes.search.v3',
+    'recipe_types.get.v2',
+    'foods.get_favorites.v2',
+    'foods.get_most_eaten.v2',
+    'foods.get_recently_eaten.v2',
+    'recipe.get_favorites.v2',
+    'saved_meals.get.v2',
+    'saved_meal_items.get.v2',
+    'profile.get',
+    'food_entries.get.v2',
+    'food_entries.get_month.v2',
+    'exercises.get.v2',
+    'exercise_entries.get.v2',
+    'exercise_entries.get_month.v2',
+    'weights.get_month.v2',
+})
+
+
+def is_read_method(method: str) -> bool:
+    """
+    Returns whether the API method only reads data.
+    """
+    return method in READ_METHODS
@@ -0,0 +1,223 @@
+"""
+Module `models.py` contains compact typed models of the API responses.
+
+The API returns numbers as strings and nests lists in wrapper dicts. The models parse the
+numbers once, intern the strings that repeat across many servings (units, descriptions,
+meals) and use `__slots__`, so that large numbers of them take a fraction of the memory of
+the response dicts. Sub-objects, like the servings of a food, are parsed on first access.
+"""
+import sys
+from pyfatsecret.utils import as_list
+
+NUTRIENTS = ('calories', 'carbohydrate', 'protein', 'fat', 'saturated_fat', 'polyunsaturated_fat',
+             'monounsaturated_fat', 'trans_fat', 'cholesterol', 'sodium', 'potassium', 'fiber', 'sugar',
+             'added_sugars', 'vitamin_d', 'vitamin_a', 'vitamin_c', 'calcium', 'iron')
+
+
+def to_int(value):
+    return None if value is None or value == '' else int(value)
+
+
+def to_float(value):
+    return None if value is None or value == '' else float(value)
+
+
+def to_bool(value):
+    return None if value is None else str(value).lower() in ('1', 'true')
+
+
+def to_interned(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def to_str(value):
+    return value
+
+
+class Model:
+    """
+    Base class of the models. `FIELDS` maps the attributes parsed from the response to
+    their converters.
+    """
+
+    __slots__ = ()
+    FIELDS = {}
+
+    def __init__(self, data: dict) -> None:
+        for name, convert in self.FIELDS.items():
+            setattr(self, name, convert(data.get(name)))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in list(self.FIELDS)[:3])
+        return f"{type(self).__name__}({fields})"
+
+
+NUTRIENT_FIELDS = dict.fromkeys(NUTRIENTS, to_float)
+
+
+class Serving(Model):
+    """
+    A serving of a food with its nutrients. Missing nutrients are None.
+    """
+
+    FIELDS = {
+        'serving_id': to_int,
+        'serving_description': to_interned,
+        'metric_serving_amount': to_float,
+        'metric_serving_unit': to_interned,
+        'number_of_units': to_float,
+        'measurement_description': to_interned,
+        'is_default': to_bool,
+        **NUTRIENT_FIELDS,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Food(Model):
+    """
+    A food of `food_get_v4`. `servings` and `sub_categories` are parsed on first access.
+    """
+
+    FIELDS = {
+        'food_id': to_int,
+        'food_name': to_str,
+        'food_type': to_interned,
+        'brand_name': to_interned,
+        'food_url': to_str,
+    }
+    __slots__ = tuple(FIELDS) + ('_servings', '_sub_categories')
+
+    def __init__(self, data: dict) -> None:
+        super().__init__(data)
+        self._servings = (data.get('servings') or {}).get('serving')
+        self._sub_categories = (data.get('food_sub_categories') or {}).get('food_sub_category')
+
+    @classmethod
+    def from_response(cls, response: dict) -> 'Food':
+        """
+        Parses the response of `food_get_v4`.
+        """
+        return cls(response['food'])
+
+    @property
+    def servings(self) -> list[Serving]:
+        if not isinstance(self._servings, tuple):
+            self._servings = tuple(Serving(serving) for serving in as_list(self._servings))
+        return list(self._servings)
+
+    @property
+    def sub_categories(self) -> list[str]:
+        if not isinstance(self._sub_categories, tuple):
+            self._sub_categories = tuple(to_interned(sub_category)
+                                         for sub_category in as_list(self._sub_categories))
+        return list(self._sub_categories)
+
+    @property
+    def default_serving(self) -> Serving:
+        """
+        The serving flagged as default (requires `flag_default_serving`), else the first one.
+        """
+        servings = self.servings
+        return next((serving for serving in servings if serving.is_default), servings[0] if servings else None)
+
+
+class Ingredient(Model):
+    """
+    An ingredient of a recipe.
+    """
+
+    FIELDS = {
+        'food_id': to_int,
+        'food_name': to_str,
+        'serving_id': to_int,
+        'number_of_units': to_float,
+        'measurement_description': to_interned,
+        'ingredient_description': to_str,
+        'ingredient_url': to_str,
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class Recipe(Model):
+    """
+    A recipe of `recipe_get_v2`. The nutrients are those of one serving of the recipe.
+    `ingredients`, `directions` and `recipe_types` are parsed on first access.
+    """
+
+    FIELDS = {
+        'recipe_id': to_int,
+        'recipe_name': to_str,
+        'recipe_description': to_str,
+        'recipe_url': to_str,
+        'number_of_servings': to_float,
+        'grams_per_portion': to_float,
+        'preparation_time_min': to_int,
+        'cooking_time_min': to_int,
+        'rating': to_float,
+    }
+    __slots__ = tuple(FIELDS) + ('serving', '_ingredients', '_directions', '_recipe_types')
+
+    def __init__(self, data: dict) -> None:
+        super().__init__(data)
+        serving = (data.get('serving_sizes') or {}).get('serving')
+        self.serving = Serving(serving) if serving else None
+        self._ingredients = (data.get('ingredients') or {}).get('ingredient')
+        self._directions = (data.get('directions') or {}).get('direction')
+        self._recipe_types = (data.get('recipe_types') or {}).get('recipe_type')
+
+    @classmethod
+    def from_response(cls, response: dict) -> 'Recipe':
+        """
+        Parses the response of `recipe_get_v2`.
+        """
+        return cls(response['recipe'])
+
+    @property
+    def ingredients(self) -> list[Ingredient]:
+        if not isinstance(self._ingredients, tuple):
+            self._ingredients = tuple(Ingredient(ingredient) for ingredient in as_list(self._ingredients))
+        return list(self._ingredients)
+
+    @property
+    def directions(self) -> list[str]:
+        if not isinstance(self._directions, tuple):
+            directions = sorted(as_list(self._directions),
+                                key=lambda direction: to_int(direction.get('direction_number')) or 0)
+            self._directions = tuple(direction.get('direction_description') for direction in directions)
+        return list(self._directions)
+
+    @property
+    def recipe_types(self) -> list[str]:
+        if not isinstance(self._recipe_types, tuple):
+            self._recipe_types = tuple(to_interned(recipe_type) for recipe_type in as_list(self._recipe_types))
+        return list(self._recipe_types)
+
+
+class FoodEntry(Model):
+    """
+    A food diary entry of `food_entries_get_v2`. The nutrients are those of the whole entry.
+    """
+
+    FIELDS = {
+        'food_entry_id': to_int,
+        'food_entry_name': to_str,
+        'food_entry_description': to_interned,
+        'date_int': to_int,
+        'meal': to_interned,
+        'food_id': to_int,
+        'serving_id': to_int,
+        'number_of_units': to_float,
+        **NUTRIENT_FIELDS,
+    }
+    __slots__ = tuple(FIELDS)
+
+    @classmethod
+    def list_from_response(cls, response: dict) -> list['FoodEntry']:
+        """
+        Parses the response of `food_entries_get_v2`.
+        """
+        return [cls(entry) for entry in as_list((response.get('food_entries') or {}).get('food_entry'))]
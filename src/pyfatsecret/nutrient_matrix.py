@@ -0,0 +1,123 @@
+"""
+Module `nutrient_matrix.py` converts servings into a columnar NumPy structure for analytics.
+Requires `numpy`, which is installed with `pip install pyfatsecret[numpy]`.
+"""
+from pyfatsecret.models import NUTRIENTS
+from pyfatsecret.utils import as_list
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NAN = float('nan')
+
+
+def get_field(serving, name: str):
+    """
+    Returns a field of a serving dict or a `Serving` model, NaN if it is missing.
+    """
+    value = serving.get(name) if isinstance(serving, dict) else getattr(serving, name, None)
+    return NAN if value is None or value == '' else value
+
+
+def get_servings(food) -> list:
+    """
+    Returns the servings of a food given as a response of `food_get_v4`, a food dict of it
+    or of a search result, or a `Food` model.
+    """
+    if isinstance(food, dict):
+        food = food.get('food', food)
+        return as_list((food.get('servings') or {}).get('serving'))
+    return food.servings
+
+
+class NutrientMatrix:
+    """
+    Nutrients of many servings as a float matrix with one row per serving.
+
+    Attributes:
+        values (numpy.ndarray): Float matrix of shape (servings, columns), NaN for missing nutrients.
+        food_ids (numpy.ndarray): Food ID of each row, -1 if unknown.
+        serving_ids (numpy.ndarray): Serving ID of each row, -1 if unknown.
+        number_of_units (numpy.ndarray): Number of units of each serving, NaN if unknown.
+        columns (tuple): Nutrient of each column.
+        column_index (dict): Column of each nutrient.
+    """
+
+    def __init__(self, values, food_ids, serving_ids, number_of_units, columns: tuple = NUTRIENTS) -> None:
+        self.values = values
+        self.food_ids = food_ids
+        self.serving_ids = serving_ids
+        self.number_of_units = number_of_units
+        self.columns = tuple(columns)
+        self.column_index = {column: index for index, column in enumerate(self.columns)}
+
+    @classmethod
+    def from_servings(cls, servings, food_ids=None, columns: tuple = NUTRIENTS) -> 'NutrientMatrix':
+        """
+        Builds the matrix from servings.
+
+        Parameters:
+            servings (Iterable): Serving dicts of the API or `Serving` models.
+            food_ids (Iterable, optional): Food ID of each serving.
+            columns (tuple, optional): Nutrients to include. Defaults to all of `models.NUTRIENTS`.
+        """
+        if numpy is None:
+            raise ImportError("NutrientMatrix requires numpy: pip install pyfatsecret[numpy]")
+        servings = list(servings)
+        # One conversion of all fields at once; numpy parses the number strings of the API.
+        values = numpy.array([get_field(serving, column) for serving in servings for column in columns],
+                             dtype=numpy.float64).reshape(len(servings), len(columns))
+        serving_ids = numpy.array([get_field(serving, 'serving_id') for serving in servings], dtype=numpy.float64)
+        number_of_units = numpy.array([get_field(serving, 'number_of_units') for serving in servings],
+                                      dtype=numpy.float64)
+        food_ids = numpy.array(list(food_ids) if food_ids is not None else [NAN] * len(servings),
+                               dtype=numpy.float64)
+        return cls(values, cls._to_ids(food_ids), cls._to_ids(serving_ids), number_of_units, columns)
+
+    @classmethod
+    def from_foods(cls, foods, columns: tuple = NUTRIENTS) -> 'NutrientMatrix':
+        """
+        Builds the matrix from all servings of the given foods.
+
+        Parameters:
+            foods (Iterable): Responses of `food_get_v4`, foods of `foods_search_v3` results or `Food` models.
+            columns (tuple, optional): Nutrients to include. Defaults to all of `models.NUTRIENTS`.
+        """
+        servings, food_ids = [], []
+        for food in foods:
+            food_servings = get_servings(food)
+            servings += food_servings
+            food_id = food.get('food', food).get('food_id') if isinstance(food, dict) else food.food_id
+            food_ids += [NAN if food_id is None else food_id] * len(food_servings)
+        return cls.from_servings(servings, food_ids, columns)
+
+    @staticmethod
+    def _to_ids(ids):
+        return numpy.where(numpy.isnan(ids), -1, ids).astype(numpy.int64)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def column(self, nutrient: str):
+        """
+        Returns the values of one nutrient for all rows.
+        """
+        return self.values[:, self.column_index[nutrient]]
+
+    def per_unit(self):
+        """
+        Returns the nutrients of one unit of each serving, e.g. of one tablespoon for a
+        serving of "2 tablespoons".
+        """
+        return self.values / self.number_of_units[:, None]
+
+    def scale(self, units):
+        """
+        Returns the nutrients for the given number of units of each serving.
+
+        Parameters:
+            units (float or numpy.ndarray): Number of units, for all rows or one per row.
+        """
+        return self.values * (numpy.asarray(units, dtype=numpy.float64) / self.number_of_units)[..., None]
@@ -0,0 +1,157 @@
+import math
+import threading
+import time
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a call would have to wait longer than allowed for the rate limiter.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket that holds up to `capacity` tokens and is refilled at `rate` tokens per second.
+    It is not thread-safe on its own; `RateLimiter` guards it.
+    """
+
+    def __init__(self, capacity: float, rate: float) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens +
+                          (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def wait_time(self, weight: float) -> float:
+        """
+        Returns the seconds until `weight` tokens would be available.
+        """
+        return max(0.0, (weight - self.tokens) / self.rate)
+
+
+class FixedWindow:
+    """
+    Quota of `capacity` tokens per window of `length` seconds. Windows are aligned to the
+    Unix epoch, so daily windows start at midnight UTC. Tokens left at the end of a window
+    are lost; tokens reserved beyond the quota are taken from the following windows.
+    Like `TokenBucket`, it is guarded by `RateLimiter`.
+    """
+
+    def __init__(self, capacity: float, length: float = 86400) -> None:
+        self.capacity = capacity
+        self.length = length
+        self.tokens = capacity
+        self._window = self._get_window()
+
+    def _get_window(self) -> int:
+        return int(time.time() // self.length)
+
+    def refill(self) -> None:
+        window = self._get_window()
+        if window > self._window:
+            self.tokens = min(self.capacity, self.tokens +
+                              (window - self._window) * self.capacity)
+            self._window = window
+
+    def wait_time(self, weight: float) -> float:
+        """
+        Returns the seconds until `weight` tokens would be available.
+        """
+        if weight <= self.tokens:
+            return 0.0
+        windows = math.ceil((weight - self.tokens) / self.capacity)
+        return max(0.0, (self._window + windows) * self.length - time.time())
+
+
+class RateLimiter:
+    """
+    Thread-safe client-side rate limiter with a per-second token bucket and a daily quota.
+
+    Share one instance between all clients that use the same quota, e.g. by passing it
+    to `Fatsecret`. Every API call takes the weight of its method from all buckets and
+    waits until the tokens are available. Waiting callers are served in order. The daily
+    quota is a `FixedWindow` that resets at midnight UTC, so no more than `per_day` calls
+    are made in any calendar day.
+    """
+
+    def __init__(self, per_second: float = None, per_day: float = None, weights: dict = None,
+                 max_wait: float = None) -> None:
+        """
+        Initializes the rate limiter.
+
+        Parameters:
+            per_second (float, optional): Calls allowed per second, which is also the burst size.
+            per_day (float, optional): Calls allowed per day, from midnight to midnight UTC.
+            weights (dict, optional): Weight per API method, e.g. {'foods.search.v3': 2}.
+                Methods that are not listed have weight 1.
+            max_wait (float, optional): Raise `RateLimitExceeded` instead of waiting longer than
+                this many seconds. By default calls wait as long as needed.
+        """
+        self.weights = weights or {}
+        self.max_wait = max_wait
+        self.buckets = {}
+        if per_second is not None:
+            self.buckets['per_second'] = TokenBucket(per_second, per_second)
+        if per_day is not None:
+            self.buckets['per_day'] = FixedWindow(per_day)
+        self._lock = threading.Lock()
+
+    def reserve(self, method: str) -> float:
+        """
+        Takes the weight of `method` from all buckets, even if they don't hold enough
+        tokens yet, and returns how long the caller has to wait before making the call.
+
+        Parameters:
+            method (str): The API method to call.
+
+        Raises:
+            RateLimitExceeded: when the wait would be longer than `max_wait`. Nothing is taken then.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        weight = self.weights.get(method, 1)
+        with self._lock:
+            for bucket in self.buckets.values():
+                bucket.refill()
+            wait = max((bucket.wait_time(weight)
+                       for bucket in self.buckets.values()), default=0.0)
+            if self.max_wait is not None and wait > self.max_wait:
+                raise RateLimitExceeded(
+                    f"Calling '{method}' would exceed the rate limit for {wait:.1f} seconds")
+            for bucket in self.buckets.values():
+                bucket.tokens -= weight
+        return wait
+
+    def acquire(self, method: str) -> None:
+        """
+        Blocks until `method` may be called.
+
+        Parameters:
+            method (str): The API method to call.
+
+        Raises:
+            RateLimitExceeded: when the wait would be longer than `max_wait`.
+        """
+        wait = self.reserve(method)
+        if wait > 0:
+            time.sleep(wait)
+
+    def utilization(self) -> dict:
+        """
+        Returns how much of each bucket is currently used.
+
+        Returns:
+            dict: For each bucket ('per_second', 'per_day'), the fraction of its capacity
+            that is used; for 'per_day', the fraction of today's quota. Values above 1 mean
+            that callers are waiting for tokens.
+        """
+        with self._lock:
+            for bucket in self.buckets.values():
+                bucket.refill()
+            return {name: 1 - bucket.tokens / bucket.capacity for name, bucket in self.buckets.items()}
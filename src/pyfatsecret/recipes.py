@@ -7,9 +7,10 @@ Module 'recipes.py' contains the following methods:
 and was generated on 04.05.2024 15:56.
 """
 from pyfatsecret.fatsecret_base import FatsecretBase
+from pyfatsecret.extensions import RecipesExtensions
 
 
-class Recipes(FatsecretBase):
+class Recipes(RecipesExtensions, FatsecretBase):
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
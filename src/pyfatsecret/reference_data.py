@@ -0,0 +1,282 @@
+"""
+Module `reference_data.py` keeps a local snapshot of the slow-changing catalogs of the API:
+food categories, sub-categories, brands and recipe types.
+"""
+import json
+import os
+import string
+import tempfile
+import threading
+import time
+from concurrent.futures import wait
+from pyfatsecret.utils import as_list, file_lock
+
+BRAND_TYPES = ('manufacturer', 'restaurant', 'supermarket')
+# "*" returns the brands that start with a digit.
+LETTERS = tuple(string.ascii_lowercase) + ('*',)
+
+
+class ReferenceSnapshot:
+    """
+    Indexed catalogs of one region and language. It is not modified after it was built, so
+    it can be read from any thread without locking.
+
+    Attributes:
+        categories (dict): Food category name by food_category_id.
+        sub_categories (dict): Names of the sub-categories by food_category_id.
+        brands (dict): Sorted brand names by brand type.
+        recipe_types (list): Names of the recipe types.
+        parts (dict): The crawled parts with their items and the time they were fetched.
+    """
+
+    def __init__(self, parts: dict = None) -> None:
+        """
+        Parameters:
+            parts (dict, optional): Items and fetch time by part, e.g. 'categories',
+                'sub_categories/3' or 'brands/manufacturer/a'.
+        """
+        self.parts = parts or {}
+        self.categories = {}
+        self.sub_categories = {}
+        self.brands = {brand_type: [] for brand_type in BRAND_TYPES}
+        self.recipe_types = []
+        self._category_ids = {}
+        self._brand_types = {}
+
+        for category in self.get_items('categories'):
+            category_id = int(category['food_category_id'])
+            self.categories[category_id] = category.get('food_category_name')
+            self._category_ids[str(category.get('food_category_name')).lower()] = category_id
+        for name, part in self.parts.items():
+            kind, *key = name.split('/')
+            if kind == 'sub_categories':
+                self.sub_categories[int(key[0])] = [
+                    sub_category.get('food_sub_category_name') if isinstance(sub_category, dict) else sub_category
+                    for sub_category in part['items']]
+            elif kind == 'brands':
+                self.brands.setdefault(key[0], []).extend(part['items'])
+                for brand in part['items']:
+                    self._brand_types.setdefault(brand.lower(), key[0])
+        for brands in self.brands.values():
+            brands.sort(key=str.lower)
+        self.recipe_types = list(self.get_items('recipe_types'))
+
+    def get_items(self, part: str) -> list:
+        return (self.parts.get(part) or {}).get('items', [])
+
+    def get_fetched_at(self, part: str) -> float:
+        """
+        Returns when a part was fetched, 0 if it never was.
+        """
+        return (self.parts.get(part) or {}).get('fetched_at', 0.0)
+
+    def category_name(self, food_category_id) -> str:
+        return self.categories.get(int(food_category_id))
+
+    def category_id(self, name: str) -> int:
+        return self._category_ids.get(name.lower())
+
+    def get_sub_categories(self, food_category_id) -> list[str]:
+        return list(self.sub_categories.get(int(food_category_id), ()))
+
+    def brand_type(self, brand: str) -> str:
+        """
+        Returns the type of a brand ("manufacturer", "restaurant" or "supermarket"), None for unknown brands.
+        """
+        return self._brand_types.get(brand.lower())
+
+    def get_brands(self, brand_type: str = 'manufacturer', starts_with: str = None) -> list[str]:
+        brands = self.brands.get(brand_type, [])
+        if starts_with is None:
+            return list(brands)
+        starts_with = starts_with.lower()
+        return [brand for brand in brands if brand.lower().startswith(starts_with)]
+
+
+class ReferenceData:
+    """
+    Crawls the catalogs of one region and language and keeps them as a `ReferenceSnapshot`.
+
+    The catalog is split into parts: the categories, the sub-categories of each category,
+    the brands of each brand type and letter, and the recipe types. They are fetched
+    concurrently on the client's executor. A refresh only fetches the parts older than
+    `max_age`, and a part that fails keeps its previous items. With a path, the snapshot
+    is saved after each refresh and loaded on start, so that a restart doesn't crawl again.
+
+    Example:
+        |   reference_data = ReferenceData(fatsecret.foods, fatsecret.recipes, path='reference-data.json')
+        |   reference_data.start()
+        |   reference_data.snapshot.category_name(3)
+    """
+
+    def __init__(self, foods, recipes=None, path: str = None, region: str = None, language: str = None,
+                 brand_types: tuple = BRAND_TYPES, letters: tuple = LETTERS, max_age: float = 86400) -> None:
+        """
+        Parameters:
+            foods (Foods): Client for the food catalogs.
+            recipes (Recipes, optional): Client for the recipe types, which are skipped without it.
+            path (str, optional): JSON file to save the snapshots in. Several locales, and processes,
+                can share it; saves are serialized with the lock file `path` + '.lock'.
+            region (String, optional): Region of the catalogs, e.g. "FR".
+            language (String, optional): Language of the catalogs, e.g. "fr".
+            brand_types (tuple, optional): Brand types to crawl.
+            letters (tuple, optional): First letters of the brands to crawl.
+            max_age (float, optional): Seconds after which a part is fetched again.
+        """
+        self.foods = foods
+        self.recipes = recipes
+        self.path = path
+        self.region = region
+        self.language = language
+        self.brand_types = brand_types
+        self.letters = letters
+        self.max_age = max_age
+        self.errors = {}
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._stop_refresh = threading.Event()
+        if path is not None:
+            self._snapshot = self._load()
+
+    @property
+    def locale_key(self) -> str:
+        return f'{self.region or ""}|{self.language or ""}'
+
+    @property
+    def snapshot(self) -> ReferenceSnapshot:
+        """
+        The current snapshot. The catalogs are crawled on first use if no snapshot was loaded.
+        """
+        if self._snapshot is None:
+            self.refresh()
+        return self._snapshot
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                parts = json.load(file).get(self.locale_key)
+        except (FileNotFoundError, ValueError):
+            return None
+        return None if parts is None else ReferenceSnapshot(parts)
+
+    def _save(self, snapshot: ReferenceSnapshot) -> None:
+        # The file lock keeps the snapshots of other locales saved meanwhile by other
+        # instances or processes.
+        with file_lock(self.path + '.lock'):
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    snapshots = json.load(file)
+            except (FileNotFoundError, ValueError):
+                snapshots = {}
+            snapshots[self.locale_key] = snapshot.parts
+            # Write to a temporary file first, so that readers never see a partial file.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                            prefix=os.path.basename(self.path), suffix='.tmp')
+            try:
+                with open(fd, 'w', encoding='utf-8') as file:
+                    json.dump(snapshots, file)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _get_part_fetchers(self, categories: list) -> dict:
+        """
+        Returns a function fetching the items of each part.
+        """
+        locale = {'region': self.region, 'language': self.language}
+        fetchers = {
+            'categories': lambda: as_list(
+                (self.foods.food_categories_get_v2(**locale).get('food_categories') or {}).get('food_category')),
+        }
+        for category in categories:
+            fetchers[f"sub_categories/{category['food_category_id']}"] = (
+                lambda category_id=category['food_category_id']: as_list(
+                    (self.foods.food_sub_categories_get_v2(category_id, **locale).get('food_sub_categories') or {})
+                    .get('food_sub_category')))
+        for brand_type in self.brand_types:
+            for letter in self.letters:
+                fetchers[f'brands/{brand_type}/{letter}'] = (
+                    lambda brand_type=brand_type, letter=letter: as_list(
+                        (self.foods.food_brands_get_v2(letter, brand_type=brand_type, **locale).get('food_brands') or {})
+                        .get('food_brand')))
+        if self.recipes is not None:
+            fetchers['recipe_types'] = lambda: as_list(
+                (self.recipes.recipe_types_get_v2(**locale).get('recipe_types') or {}).get('recipe_type'))
+        return fetchers
+
+    def _fetch_parts(self, fetchers: dict, parts: dict) -> None:
+        """
+        Fetches the given parts concurrently into `parts`, or one after the other on a thread of
+        the client's executor. Failed parts are recorded in `errors`.
+        """
+        futures = {name: self.foods.submit(fetch) for name, fetch in fetchers.items()}
+        wait(futures.values())
+        for name, future in futures.items():
+            if future.exception() is not None:
+                self.errors[name] = future.exception()
+            else:
+                self.errors.pop(name, None)
+                parts[name] = {'items': future.result(), 'fetched_at': time.time()}
+
+    def refresh(self, max_age: float = None) -> ReferenceSnapshot:
+        """
+        Fetches the parts of the catalogs that are older than `max_age` and replaces the snapshot.
+
+        Parameters:
+            max_age (float, optional): Seconds after which a part is fetched again. All parts
+                are fetched if it is not given.
+
+        Returns:
+            ReferenceSnapshot: The new snapshot. Failed parts are in `errors`.
+        """
+        with self._refresh_lock:
+            previous = self._snapshot or ReferenceSnapshot()
+            parts = dict(previous.parts)
+            oldest = float('inf') if max_age is None else time.time() - max_age
+
+            def get_stale_fetchers(categories):
+                return {name: fetch for name, fetch in self._get_part_fetchers(categories).items()
+                        if previous.get_fetched_at(name) <= oldest}
+
+            # The sub-categories are crawled for the categories, so these come first.
+            fetchers = get_stale_fetchers(previous.get_items('categories'))
+            if 'categories' in fetchers:
+                self._fetch_parts({'categories': fetchers['categories']}, parts)
+            categories = (parts.get('categories') or {}).get('items', [])
+            fetchers = get_stale_fetchers(categories)
+            fetchers.pop('categories', None)
+            self._fetch_parts(fetchers, parts)
+
+            category_ids = {str(category['food_category_id']) for category in categories}
+            parts = {name: part for name, part in parts.items()
+                     if not name.startswith('sub_categories/') or name.split('/')[1] in category_ids}
+            self._snapshot = ReferenceSnapshot(parts)
+            if self.path is not None:
+                self._save(self._snapshot)
+            return self._snapshot
+
+    def _refresh_periodically(self, interval: float) -> None:
+        while not self._stop_refresh.wait(interval):
+            try:
+                self.refresh(self.max_age)
+            except Exception:
+                # Failed parts keep their items; the next run tries again.
+                pass
+
+    def start(self, interval: float = 3600) -> None:
+        """
+        Refreshes the parts older than `max_age` on a background thread every `interval` seconds,
+        after loading or crawling the first snapshot if needed.
+        """
+        self._stop_refresh.clear()
+        if self._snapshot is None:
+            self.refresh()
+        threading.Thread(target=self._refresh_periodically, args=(interval,),
+                         name='pyfatsecret-reference-data', daemon=True).start()
+
+    def stop(self) -> None:
+        """
+        Stops the background refresh.
+        """
+        self._stop_refresh.set()
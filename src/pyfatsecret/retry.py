@@ -0,0 +1,63 @@
+import random
+from pyfatsecret.errors import FatsecretError, FatsecretRateLimitError, FatsecretInvalidTokenError
+from pyfatsecret.methods import READ_METHODS
+
+
+class RetryPolicy:
+    """
+    Decides which failed API calls are sent again and how long to wait in between.
+
+    Only retryable errors are retried: network errors, timeouts and retryable
+    `FatsecretError`s. Calls of methods that are not idempotent, e.g. `food_entry.create`,
+    are only retried when the request was certainly not processed: it could not be
+    sent at all, or FatSecret rejected it because of the rate limit or the token.
+    The waits grow exponentially with full jitter, and all attempts of a call
+    together never take longer than `deadline`.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 5.0,
+                 deadline: float = 60.0, idempotent_methods=READ_METHODS) -> None:
+        """
+        Initializes the retry policy.
+
+        Parameters:
+            max_attempts (int, optional): Maximum number of attempts per call, 1 disables retries.
+            base_delay (float, optional): Upper bound in seconds of the wait after the first attempt.
+            max_delay (float, optional): Upper bound in seconds of any wait.
+            deadline (float, optional): Seconds that all attempts of a call may take together,
+                None for no limit.
+            idempotent_methods (Iterable[str], optional): Methods that may be sent again after
+                any retryable error. Defaults to all methods that only read data.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Returns the seconds to wait after the given attempt (starting at 1).
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def is_retryable(self, error: Exception, method: str, transport) -> bool:
+        """
+        Returns whether a call of `method` that failed with `error` may be sent again.
+
+        Parameters:
+            error (Exception): The error of the last attempt.
+            method (str): The API method.
+            transport: The transport that sent the request. Its `CONNECT_ERRORS` are errors
+                raised before the request was sent, its `TRANSIENT_ERRORS` all other
+                retryable network errors.
+        """
+        if isinstance(error, (FatsecretRateLimitError, FatsecretInvalidTokenError)):
+            return True
+        if isinstance(error, transport.CONNECT_ERRORS):
+            return True
+        if method not in self.idempotent_methods:
+            return False
+        if isinstance(error, FatsecretError):
+            return error.retryable
+        return isinstance(error, transport.TRANSIENT_ERRORS)
@@ -0,0 +1,160 @@
+"""
+Module `search_index.py` contains a local full-text index of foods that tolerates typos.
+"""
+import heapq
+import re
+import threading
+from collections import Counter
+from pyfatsecret.cache import ResponseCache
+from pyfatsecret.models import Food
+from pyfatsecret.utils import as_list
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def get_trigrams(text: str) -> set:
+    """
+    Returns the trigrams of the words of a text. Words are padded with a space on both
+    sides, so that "chiken" and "chicken" share the trigrams of their start and end.
+    """
+    trigrams = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f' {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def get_search_text(food) -> tuple:
+    """
+    Returns the food_id and the indexed text (name, brand and sub-categories) of a food
+    given as a response of `food_get_v4`, a food dict of it or of search results, or a `Food` model.
+    """
+    if isinstance(food, Food):
+        return food.food_id, ' '.join(filter(None, [food.food_name, food.brand_name] + food.sub_categories))
+    food = food.get('food', food)
+    sub_categories = as_list((food.get('food_sub_categories') or {}).get('food_sub_category'))
+    food_id = food.get('food_id')
+    return (None if food_id is None else int(food_id),
+            ' '.join(filter(None, [food.get('food_name'), food.get('brand_name')] + sub_categories)))
+
+
+class FoodSearchIndex(ResponseCache):
+    """
+    Inverted trigram index over the names, brands and sub-categories of known foods.
+
+    Foods are added one by one with `add`, or automatically as responses of `food.get.v4`
+    and food searches arrive when the index is used as (a tier of) the client's cache:
+
+        |   index = FoodSearchIndex()
+        |   fatsecret = Fatsecret(client_id, client_secret, cache=TieredCache(index, MemoryCache()))
+        |   index.foods = fatsecret.foods
+
+    It never returns cached responses itself. The score of a food is mostly the part of the
+    query trigrams that it contains, so "chiken brest" still finds "Chicken Breast".
+    """
+
+    CANDIDATES_PER_RESULT = 4
+    blocking = False
+
+    def __init__(self, foods=None, min_score: float = 0.6) -> None:
+        """
+        Parameters:
+            foods (Foods, optional): Client that `find` falls back to.
+            min_score (float, optional): Score between 0 and 1 of the best match below which `find`
+                searches with the API.
+        """
+        self.foods = foods
+        self.min_score = min_score
+        self._food_ids = []
+        self._sizes = []
+        self._documents = {}
+        self._texts = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, food) -> None:
+        """
+        Adds a food or updates it if its text changed.
+        """
+        food_id, text = get_search_text(food)
+        if food_id is None or self._texts.get(food_id) == text:
+            return
+        trigrams = get_trigrams(text)
+        with self._lock:
+            previous = self._documents.get(food_id)
+            if previous is not None:
+                # The postings of the old text are skipped by `search` from now on.
+                self._food_ids[previous] = None
+            document = len(self._food_ids)
+            self._food_ids.append(food_id)
+            self._sizes.append(len(trigrams))
+            self._documents[food_id] = document
+            self._texts[food_id] = text
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, []).append(document)
+
+    def add_many(self, foods) -> None:
+        for food in foods:
+            self.add(food)
+
+    def get(self, method: str, params: dict):
+        return None
+
+    def set(self, method: str, params: dict, value: dict, size: int = 0) -> None:
+        if method == 'food.get.v4':
+            self.add(value)
+        elif method == 'foods.search.v3':
+            for page in as_list((value.get('foods_search') or {}).get('results')):
+                self.add_many(as_list(page.get('food')))
+        elif method == 'foods.search':
+            self.add_many(as_list((value.get('foods') or {}).get('food')))
+
+    def search(self, query: str, limit: int = 10) -> list[tuple]:
+        """
+        Returns the best matching foods of the index.
+
+        Returns:
+            list[tuple]: (food_id, score) pairs, best first. The score is between 0 and 1.
+        """
+        query_trigrams = get_trigrams(query)
+        if not query_trigrams:
+            return []
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self._postings.get(trigram, ()))
+        query_size = len(query_trigrams)
+        scored = []
+        # Only the foods with the most common trigrams, and the shortest among them, can have the best scores.
+        sizes = self._sizes
+        candidates = heapq.nlargest(limit * self.CANDIDATES_PER_RESULT, counts.items(),
+                                    key=lambda item: (item[1], -sizes[item[0]]))
+        for document, count in candidates:
+            food_id = self._food_ids[document]
+            if food_id is not None:
+                # Mostly how much of the query is found, a little how much of the food is matched.
+                score = 0.8 * count / query_size + 0.2 * 2 * count / (query_size + sizes[document])
+                scored.append((score, food_id))
+        scored.sort(key=lambda item: -item[0])
+        return [(food_id, score) for score, food_id in scored[:limit]]
+
+    def find(self, query: str, limit: int = 10, **kwargs) -> list:
+        """
+        Returns the IDs of the best matching foods, from the index if its best match scores at
+        least `min_score`, else from `foods_search_v3`. The foods found by the API are added
+        to the index.
+
+        Parameters:
+            query (str): The search expression.
+            limit (int, optional): Maximum number of food IDs.
+            **kwargs: Other parameters of `foods_search_v3`.
+        """
+        results = self.search(query, limit)
+        if (results and results[0][1] >= self.min_score) or self.foods is None:
+            return [food_id for food_id, _ in results]
+        response = self.foods.foods_search_v3(search_expression=query, max_results=limit, **kwargs)
+        foods = as_list(((response.get('foods_search') or {}).get('results') or {}).get('food'))
+        self.add_many(foods)
+        return [int(food['food_id']) for food in foods]
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls that are in flight at the same time: the first caller
+    runs the call, later callers with the same key wait for it and get its result
+    or its exception.
+    """
+
+    def __init__(self) -> None:
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Runs `func` unless a call with the same key is already running, in which case
+        its result is returned instead.
+
+        Parameters:
+            key (Hashable): Key of the call, e.g. from `get_cache_key`.
+            func (Callable): Function without arguments that makes the call.
+
+        Returns:
+            The result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Asynchronous counterpart of `SingleFlight`. A caller that is cancelled doesn't
+    cancel the call for the other callers.
+    """
+
+    def __init__(self) -> None:
+        self._futures = {}
+
+    @staticmethod
+    def _retrieve_exception(future: asyncio.Future) -> None:
+        # Avoids warnings about unretrieved exceptions when all callers were cancelled.
+        if not future.cancelled():
+            future.exception()
+
+    async def do(self, key, func):
+        """
+        Awaits `func()` unless a call with the same key is already running, in which case
+        its result is returned instead.
+
+        Parameters:
+            key (Hashable): Key of the call, e.g. from `get_cache_key`.
+            func (Callable): Coroutine function without arguments that makes the call.
+
+        Returns:
+            The result of the call.
+        """
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._futures[key] = future
+            future.add_done_callback(lambda _: self._futures.pop(key, None))
+            future.add_done_callback(self._retrieve_exception)
+        return await asyncio.shield(future)
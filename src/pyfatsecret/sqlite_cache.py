@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import threading
+import time
+from pyfatsecret.cache import ResponseCache
+
+# Methods cached by `SQLiteDetailCache` and the parameter that holds the item ID.
+DETAIL_METHODS = {
+    'food.get.v4': 'food_id',
+    'recipe.get.v2': 'recipe_id',
+}
+
+
+class SQLiteDetailCache(ResponseCache):
+    """
+    Persistent cache for food and recipe details (`food.get.v4` and `recipe.get.v2`)
+    in a local SQLite database, so that they survive restarts.
+
+    Entries are keyed by the food or recipe ID, region, language and the remaining
+    parameters, and hold the raw payload with the time it was fetched. Responses older
+    than `ttl` are still returned for `stale_ttl` seconds while a fresh one is fetched
+    in the background (stale-while-revalidate). When the payloads get larger than
+    `max_bytes`, the oldest entries are evicted. Several processes on a host can share
+    the database file.
+    """
+
+    REVALIDATION_TIMEOUT = 60
+    SIZE_CHECK_INTERVAL = 100
+
+    def __init__(self, path: str, ttl: float = 7 * 86400, stale_ttl: float = 30 * 86400,
+                 max_bytes: int = 1024 * 1024 * 1024) -> None:
+        """
+        Initializes the cache and creates the database if needed.
+
+        Parameters:
+            path (str): Path of the database file.
+            ttl (float, optional): Seconds that an entry is fresh.
+            stale_ttl (float, optional): Seconds after `ttl` that an entry is still returned
+                while it is revalidated.
+            max_bytes (int, optional): Maximum total size of the stored payloads.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._revalidating = {}
+        self._sets_since_size_check = 0
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('''CREATE TABLE IF NOT EXISTS details (
+            method TEXT, item_id TEXT, region TEXT, language TEXT, options TEXT,
+            payload BLOB, size INTEGER, fetched_at REAL,
+            PRIMARY KEY (method, item_id, region, language, options))''')
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS details_fetched_at ON details (fetched_at)')
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the current thread.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _get_key(method: str, params: dict):
+        """
+        Returns the primary key of a call, None if the call is not cached.
+        """
+        id_param = DETAIL_METHODS.get(method)
+        if id_param is None or params.get(id_param) is None:
+            return None
+        options = sorted((key, str(value).lower()) for key, value in params.items()
+                         if key not in (id_param, 'region', 'language', 'method', 'format'))
+        return (method, str(params[id_param]), str(params.get('region', '')), str(params.get('language', '')),
+                json.dumps(options))
+
+    def get(self, method: str, params: dict):
+        entry = self.get_entry(method, params)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, method: str, params: dict):
+        key = self._get_key(method, params)
+        if key is None:
+            return None
+        row = self._connection().execute('''SELECT payload, fetched_at FROM details
+            WHERE method = ? AND item_id = ? AND region = ? AND language = ? AND options = ?''', key).fetchone()
+        if row is None:
+            return None
+        age = time.time() - row[1]
+        if age >= self.ttl + self.stale_ttl:
+            return None
+        value = json.loads(row[0])
+        if age < self.ttl:
+            return value, False
+        # Only the first caller revalidates; the others get the stale value as if it was fresh.
+        with self._lock:
+            started = self._revalidating.get(key)
+            if started is not None and time.monotonic() - started < self.REVALIDATION_TIMEOUT:
+                return value, False
+            self._revalidating[key] = time.monotonic()
+        return value, True
+
+    def set(self, method: str, params: dict, value: dict, size: int = 0) -> None:
+        key = self._get_key(method, params)
+        if key is None:
+            return
+        payload = json.dumps(value, separators=(',', ':')).encode('utf-8')
+        self._connection().execute('INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                   key + (payload, len(payload), time.time()))
+        with self._lock:
+            self._revalidating.pop(key, None)
+            self._sets_since_size_check += 1
+            check_size = self._sets_since_size_check >= self.SIZE_CHECK_INTERVAL
+            if check_size:
+                self._sets_since_size_check = 0
+        if check_size:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes expired entries and then the oldest entries until the payloads fit into `max_bytes`.
+        """
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('DELETE FROM details WHERE fetched_at < ?',
+                               (time.time() - self.ttl - self.stale_ttl,))
+            excess = connection.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM details').fetchone()[0] - self.max_bytes
+            if excess > 0:
+                cutoff = None
+                for size, fetched_at in connection.execute('SELECT size, fetched_at FROM details ORDER BY fetched_at'):
+                    excess -= size
+                    if excess <= 0:
+                        cutoff = fetched_at
+                        break
+                connection.execute(
+                    'DELETE FROM details WHERE fetched_at <= ?', (cutoff,))
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def values(self, method: str = 'food.get.v4'):
+        """
+        Yields the cached responses of a method that haven't expired, e.g. to build a
+        `FoodSearchIndex` over all cached foods.
+        """
+        rows = self._connection().execute('SELECT payload FROM details WHERE method = ? AND fetched_at >= ?',
+                                          (method, time.time() - self.ttl - self.stale_ttl))
+        for row in rows:
+            yield json.loads(row[0])
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        self._connection().execute('DELETE FROM details')
@@ -0,0 +1,212 @@
+import threading
+import time
+from pyfatsecret.errors import check_token_response
+from pyfatsecret.token_store import TokenStore
+from pyfatsecret.transport import Transport
+
+
+class TokenManager:
+    """
+    Holds the OAuth 2.0 access token for one set of client credentials.
+
+    A single instance can be shared by several `FatsecretBase` clients so that
+    they all use the same token and refresh it only once. It is thread-safe: only
+    one thread refreshes the token at a time while the others keep using the
+    current token as long as it is still valid. With a `TokenStore`, the token is
+    also shared with other processes and only one of them renews it.
+    """
+
+    TOKEN_URL = "https://oauth.fatsecret.com/connect/token"
+    REFRESH_MARGIN = 600
+    RENEWAL_RETRY_DELAY = 30
+
+    def __init__(self, client_id: str, client_secret: str, lazy: bool = False, warm_up: bool = False,
+                 transport: Transport = None, renew_in_background: bool = False,
+                 token_store: TokenStore = None) -> None:
+        """
+        Initializes the token manager and, unless `lazy` is set, requests the first access token.
+
+        Parameters:
+            client_id (str): Your FatSecret application client ID.
+            client_secret (str): Your FatSecret application client secret key.
+            lazy (bool, optional): Don't request a token now but on the first use of `access_token`.
+            warm_up (bool, optional): Only used with `lazy`. Requests the first token on a
+                background thread so that it is usually ready before the first API call.
+            transport (Transport, optional): Transport used for the token requests.
+            renew_in_background (bool, optional): Renew the token on a background thread
+                before it gets close to expiring, so that API calls never wait for it.
+            token_store (TokenStore, optional): Store to share the token with other processes.
+        """
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.transport = transport or Transport()
+        self.token_store = token_store
+        # (token data, expiry timestamp), replaced as a whole so readers never see a mix.
+        self._token = None
+        self._rejected_access_token = None
+        self._lock = threading.Lock()
+        self._stop_renewal = threading.Event()
+        if not lazy:
+            self._refresh_if_needed()
+        if renew_in_background:
+            self._start_thread(self._renew, 'pyfatsecret-token-renewal')
+        elif lazy and warm_up:
+            self._start_thread(self._warm_up, 'pyfatsecret-token-warm-up')
+
+    @staticmethod
+    def _start_thread(target, name: str) -> None:
+        threading.Thread(target=target, name=name, daemon=True).start()
+
+    def _warm_up(self) -> None:
+        """
+        Requests the first token. Errors are ignored since the token is requested
+        again on first use.
+        """
+        try:
+            self._refresh_if_needed()
+        except Exception:
+            pass
+
+    def _renew(self) -> None:
+        """
+        Keeps the token fresh until `stop` is called. The token is renewed once less than
+        twice `REFRESH_MARGIN` seconds are left, i.e. long before API calls would refresh it.
+        """
+        delay = 0
+        while not self._stop_renewal.wait(delay):
+            try:
+                self._refresh_if_needed(2 * self.REFRESH_MARGIN)
+                # Tokens that live less than twice the margin would otherwise be renewed without pause.
+                delay = max(self.access_token_expires_in - 2 * self.REFRESH_MARGIN, self.RENEWAL_RETRY_DELAY)
+            except Exception:
+                delay = self.RENEWAL_RETRY_DELAY
+
+    def stop(self) -> None:
+        """
+        Stops the background renewal, if it is running.
+        """
+        self._stop_renewal.set()
+
+    def get_new_access_token(self) -> dict:
+        """
+        Requests a new access token from the FatSecret OAuth 2.0 endpoint using client credentials.
+
+        Raises:
+            FatsecretAuthError: when no token was returned, e.g. because of invalid credentials.
+
+        Returns:
+            dict: A dictionary containing the access token and other data.
+        """
+        data = {'grant_type': 'client_credentials'}
+        response = self.transport.post(self.TOKEN_URL, data=data,
+                                       auth=(self.client_id, self.client_secret))
+        try:
+            token_data = response.json()
+        except ValueError:
+            token_data = None
+        check_token_response(response.status_code, token_data)
+        return token_data
+
+    def refresh(self) -> None:
+        """
+        Replaces the current access token with a new one.
+        """
+        time_token_was_requested = time.time()
+        token_data = self.get_new_access_token()
+        self._token = (token_data, time_token_was_requested +
+                       token_data.get('expires_in'))
+
+    def _refresh_if_needed(self, margin: float = None) -> None:
+        """
+        Refreshes the token under the lock if it expires in less than `margin` seconds.
+        Callers that waited for the lock see the token refreshed by the previous holder
+        and don't refresh again.
+        """
+        margin = self.REFRESH_MARGIN if margin is None else margin
+        with self._lock:
+            self._update_token(margin)
+
+    def _update_token(self, margin: float) -> None:
+        """
+        Makes sure that the token is valid for at least `margin` seconds. Must be called
+        with the lock held. With a token store, a token stored by another process is
+        used if possible; otherwise the token is renewed under the lock of the store.
+        """
+        if self.access_token_expires_in >= margin:
+            return
+        if self.token_store is None:
+            self.refresh()
+            return
+
+        self._load_stored_token()
+        if self.access_token_expires_in >= margin:
+            return
+        with self.token_store.lock(self.client_id):
+            # Another process may have renewed it while we waited for the lock.
+            self._load_stored_token()
+            if self.access_token_expires_in < margin:
+                self.refresh()
+                self.token_store.save(self.client_id, *self._token)
+
+    def _load_stored_token(self) -> None:
+        """
+        Replaces the current token with the stored one if that one is valid for longer.
+        """
+        stored_token = self.token_store.load(self.client_id)
+        if stored_token is None or stored_token[0].get('access_token') == self._rejected_access_token:
+            return
+        if self._token is None or stored_token[1] > self._token[1]:
+            self._token = tuple(stored_token)
+
+    def invalidate(self, access_token: str) -> None:
+        """
+        Marks the token as expired if it is still the current one, e.g. after the API rejected it.
+        The next use of `access_token` requests a new token.
+
+        Parameters:
+            access_token (str): The rejected access token.
+        """
+        with self._lock:
+            self._rejected_access_token = access_token
+            token = self._token
+            if token is not None and token[0].get('access_token') == access_token:
+                # Marked as expired rather than removed, so that concurrent readers never see None.
+                self._token = (token[0], 0.0)
+
+    @property
+    def access_token(self) -> str:
+        """
+        Provides the current access token, refreshing it if it's close to expiring.
+
+        If the token is about to expire but still valid and another thread is already
+        refreshing it, the current token is returned instead of waiting.
+
+        Returns:
+            str: The access token.
+        """
+        expires_in = self.access_token_expires_in
+        if expires_in <= 0:
+            self._refresh_if_needed()
+        elif expires_in < self.REFRESH_MARGIN and self._lock.acquire(blocking=False):
+            try:
+                self._update_token(self.REFRESH_MARGIN)
+            except Exception:
+                # The current token is still valid; the next call tries again.
+                pass
+            finally:
+                self._lock.release()
+
+        return self._token[0].get('access_token')
+
+    @property
+    def access_token_expires_in(self) -> float:
+        """
+        Calculates the time in seconds until the current access token expires.
+
+        Returns:
+            float: The number of seconds until the access token expires, 0 if there is no token yet.
+        """
+        token = self._token
+        if token is None:
+            return 0.0
+        return token[1] - time.time()
@@ -0,0 +1,155 @@
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+from pyfatsecret.utils import file_lock
+
+
+class TokenStore:
+    """
+    Interface of a store that shares access tokens between processes.
+
+    `TokenManager` loads the token from the store before requesting a new one, and
+    renews it only while holding `lock`, so that only one process on a host renews
+    a token while the others reuse it.
+    """
+
+    def load(self, key: str):
+        """
+        Loads a token.
+
+        Parameters:
+            key (str): Key of the token, e.g. the client ID.
+
+        Returns:
+            tuple[dict, float] or None: The token data and its expiry timestamp,
+            None if no token is stored for `key`.
+        """
+        raise NotImplementedError
+
+    def save(self, key: str, token_data: dict, expires_at: float) -> None:
+        """
+        Saves a token.
+
+        Parameters:
+            key (str): Key of the token, e.g. the client ID.
+            token_data (dict): Token data as returned by the token endpoint.
+            expires_at (float): Timestamp when the token expires.
+        """
+        raise NotImplementedError
+
+    def lock(self, key: str):
+        """
+        Returns a context manager that holds an exclusive lock, shared between
+        processes, for renewing the token stored under `key`.
+        """
+        raise NotImplementedError
+
+
+class FileTokenStore(TokenStore):
+    """
+    Stores tokens in a JSON file that is guarded by an advisory file lock.
+    The file is only readable by its owner.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Parameters:
+            path (str): Path of the JSON file. The lock file is `path` + '.lock'.
+        """
+        self.path = path
+        self.lock_path = path + '.lock'
+        self._thread_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        with self._thread_lock, file_lock(self.lock_path):
+            yield
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def load(self, key: str):
+        entry = self._read().get(key)
+        if entry is None:
+            return None
+        return entry['token_data'], entry['expires_at']
+
+    def save(self, key: str, token_data: dict, expires_at: float) -> None:
+        tokens = self._read()
+        tokens[key] = {'token_data': token_data, 'expires_at': expires_at}
+        # Write to a temporary file first, so that readers never see a partial file.
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, 'w', encoding='utf-8') as file:
+            json.dump(tokens, file)
+        os.replace(tmp_path, self.path)
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Stores tokens in a local SQLite database. Renewals are serialized with an
+    immediate write transaction.
+    """
+
+    def __init__(self, path: str, timeout: float = 60.0) -> None:
+        """
+        Parameters:
+            path (str): Path of the database file.
+            timeout (float, optional): Seconds to wait for the lock of another process.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        # Create the file only readable by its owner before SQLite creates it.
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        with contextlib.closing(self._connect()) as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, token_data TEXT, expires_at REAL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    @contextlib.contextmanager
+    def _connection(self):
+        """
+        Yields the connection of the current lock, or a new one outside of `lock`.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            yield connection
+        else:
+            with contextlib.closing(self._connect()) as connection:
+                yield connection
+
+    @contextlib.contextmanager
+    def lock(self, key: str):
+        with contextlib.closing(self._connect()) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            self._local.connection = connection
+            try:
+                yield
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            finally:
+                self._local.connection = None
+
+    def load(self, key: str):
+        with self._connection() as connection:
+            row = connection.execute(
+                'SELECT token_data, expires_at FROM tokens WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def save(self, key: str, token_data: dict, expires_at: float) -> None:
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO tokens (key, token_data, expires_at) VALUES (?, ?, ?)',
+                               (key, json.dumps(token_data), expires_at))
@@ -0,0 +1,78 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+
+class ConnectFailedError(requests.exceptions.ConnectionError):
+    """
+    Raised by `Transport` when no connection could be established, e.g. because it was
+    refused or the host couldn't be resolved. The request was not sent.
+    """
+
+
+class Transport:
+    """
+    HTTP transport with a persistent, keep-alive connection pool.
+
+    Reusing one transport for all API calls and token requests saves the TCP and TLS
+    handshakes of a new connection per call. It can be shared between threads.
+    """
+
+    # Errors raised before the request was sent, and all retryable network errors.
+    CONNECT_ERRORS = (requests.exceptions.ConnectTimeout, ConnectFailedError)
+    TRANSIENT_ERRORS = (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout)
+
+    def __init__(self, pool_connections: int = 2, pool_maxsize: int = 10, connect_timeout: float = 5.0,
+                 read_timeout: float = 30.0) -> None:
+        """
+        Initializes the transport.
+
+        Parameters:
+            pool_connections (int, optional): Number of hosts to keep connection pools for.
+            pool_maxsize (int, optional): Maximum number of connections kept alive per host.
+            connect_timeout (float, optional): Seconds to wait for a connection to be established.
+            read_timeout (float, optional): Seconds to wait for the server to send a response.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a POST request over a pooled connection.
+
+        Parameters:
+            url (str): The URL to post to.
+            **kwargs: Passed on to `requests.Session.post`. `timeout` defaults to the
+                timeouts of the transport.
+
+        Raises:
+            ConnectFailedError: when no connection could be established.
+            requests.RequestException: when the request failed otherwise.
+
+        Returns:
+            requests.Response: The response.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            return self.session.post(url, **kwargs)
+        except requests.exceptions.ConnectTimeout:
+            raise
+        except requests.exceptions.ConnectionError as error:
+            # requests wraps the error of urllib3, whose reason tells whether the connection failed.
+            reason = getattr(error.args[0], 'reason', None) if error.args else None
+            if isinstance(reason, NewConnectionError):
+                raise ConnectFailedError(*error.args, request=error.request, response=error.response) from error
+            raise
+
+    def close(self) -> None:
+        """
+        Closes all pooled connections.
+        """
+        self.session.close()
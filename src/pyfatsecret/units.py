@@ -0,0 +1,188 @@
+"""
+Module `units.py` computes the nutrients of any amount of a food from its servings, without API calls.
+"""
+import re
+from pyfatsecret.models import Food, NUTRIENTS
+
+GRAMS = {
+    'g': 1.0, 'gram': 1.0, 'mg': 0.001, 'milligram': 0.001, 'kg': 1000.0, 'kilogram': 1000.0,
+    'oz': 28.349523125, 'ounce': 28.349523125, 'lb': 453.59237, 'pound': 453.59237,
+}
+MILLILITERS = {
+    'ml': 1.0, 'milliliter': 1.0, 'millilitre': 1.0, 'l': 1000.0, 'liter': 1000.0, 'litre': 1000.0,
+    'cup': 236.5882365, 'tbsp': 14.78676478125, 'tablespoon': 14.78676478125, 'tsp': 4.92892159375,
+    'teaspoon': 4.92892159375, 'fl oz': 29.5735295625, 'fluid ounce': 29.5735295625, 'pint': 473.176473,
+    'quart': 946.352946, 'gallon': 3785.411784,
+}
+
+QUANTITY_PATTERN = re.compile(r'^\s*(\d+(?:\.\d*)?(?:\s*/\s*\d+)?|\.\d+)\s*(.*?)\s*$')
+
+
+def normalize_unit(unit: str) -> str:
+    """
+    Returns the unit in lower case, without details after a comma or parenthesis, without
+    dots and in singular, e.g. "Cups, chopped" -> "cup".
+    """
+    unit = re.split(r'[,(]', unit.lower(), maxsplit=1)[0].replace('.', '')
+    unit = ' '.join(unit.split())
+    if unit.endswith('s') and not unit.endswith('ss') and len(unit) > 2:
+        unit = unit[:-1]
+    return unit
+
+
+def parse_quantity(amount: str) -> tuple:
+    """
+    Splits an amount like "150 g", "2.5 cups" or "1/2 cup" into the quantity and the unit.
+
+    Raises:
+        ValueError: when the amount doesn't start with a number.
+    """
+    match = QUANTITY_PATTERN.match(amount)
+    if match is None:
+        raise ValueError(f"'{amount}' is not an amount")
+    number, unit = match.groups()
+    if '/' in number:
+        numerator, denominator = number.split('/')
+        quantity = float(numerator) / float(denominator)
+    else:
+        quantity = float(number)
+    return quantity, unit
+
+
+def get_metric_amount(amount: float, unit: str, units: dict):
+    """
+    Returns the amount in grams or milliliters if the unit is one of `units`, else None.
+    """
+    if amount is None or not unit:
+        return None
+    factor = units.get(normalize_unit(unit))
+    return None if factor is None else amount * factor
+
+
+class ServingConverter:
+    """
+    Conversion table of one food, built from its servings.
+
+    An amount can be given in the measurement of one of the servings (e.g. "slice" or
+    "medium"), in a unit of mass or, if the food has a serving whose volume is known, in
+    a unit of volume. The density of a serving with both a mass and a volume is used to
+    convert between them.
+    """
+
+    def __init__(self, food) -> None:
+        """
+        Parameters:
+            food: Response of `food_get_v4`, a food dict with servings or a `Food` model.
+        """
+        if isinstance(food, dict):
+            food = Food.from_response(food) if 'food' in food else Food(food)
+        self.food_id = food.food_id
+        self.servings = food.servings
+        self.measures = {}
+        self.grams = []
+        self.milliliters = []
+        for serving in self.servings:
+            if serving.measurement_description and serving.number_of_units:
+                self.measures.setdefault(normalize_unit(serving.measurement_description),
+                                         (serving, serving.number_of_units))
+            grams = get_metric_amount(serving.metric_serving_amount, serving.metric_serving_unit, GRAMS)
+            milliliters = get_metric_amount(serving.metric_serving_amount, serving.metric_serving_unit, MILLILITERS)
+            if milliliters is None and serving.number_of_units and serving.measurement_description:
+                milliliters = get_metric_amount(serving.number_of_units, serving.measurement_description, MILLILITERS)
+            if grams is None and serving.number_of_units and serving.measurement_description:
+                grams = get_metric_amount(serving.number_of_units, serving.measurement_description, GRAMS)
+            if grams is not None:
+                self.grams.append((serving, grams))
+            if milliliters is not None:
+                self.milliliters.append((serving, milliliters))
+        densities = [grams / milliliters for serving, grams in self.grams
+                     for other, milliliters in self.milliliters if serving is other and milliliters]
+        # Grams per milliliter, None if no serving has both a mass and a volume.
+        self.density = densities[0] if densities else None
+
+    @property
+    def units(self) -> list[str]:
+        """
+        The units that amounts can be given in.
+        """
+        units = list(self.measures)
+        if self.grams or (self.milliliters and self.density):
+            units += [unit for unit in GRAMS if unit not in units]
+        if self.milliliters or (self.grams and self.density):
+            units += [unit for unit in MILLILITERS if unit not in units]
+        return units
+
+    def get_factor(self, quantity: float, unit: str) -> tuple:
+        """
+        Returns the serving to scale and the factor to scale its nutrients with.
+
+        Raises:
+            ValueError: when the food has no serving that the unit can be converted to.
+        """
+        unit = normalize_unit(unit)
+        if unit in self.measures:
+            serving, number_of_units = self.measures[unit]
+            return serving, quantity / number_of_units
+        if unit in GRAMS:
+            if self.grams:
+                serving, grams = self.grams[0]
+                return serving, quantity * GRAMS[unit] / grams
+            if self.milliliters and self.density:
+                serving, milliliters = self.milliliters[0]
+                return serving, quantity * GRAMS[unit] / self.density / milliliters
+        elif unit in MILLILITERS:
+            if self.milliliters:
+                serving, milliliters = self.milliliters[0]
+                return serving, quantity * MILLILITERS[unit] / milliliters
+            if self.grams and self.density:
+                serving, grams = self.grams[0]
+                return serving, quantity * MILLILITERS[unit] * self.density / grams
+        raise ValueError(f"Food {self.food_id} has no serving that '{unit}' can be converted to")
+
+    def nutrients(self, amount, unit: str = None) -> dict:
+        """
+        Returns the nutrients of an amount of the food.
+
+        Parameters:
+            amount (str or float): An amount like "150 g", or the quantity if `unit` is given.
+            unit (str, optional): Unit of the quantity, e.g. "cup", "g" or "slice".
+
+        Raises:
+            ValueError: when the amount can't be parsed or its unit can't be converted.
+
+        Returns:
+            dict: The nutrients of `models.NUTRIENTS`, None for those the serving doesn't have.
+        """
+        if unit is None:
+            amount, unit = parse_quantity(amount)
+        serving, factor = self.get_factor(float(amount), unit)
+        return {nutrient: None if getattr(serving, nutrient) is None else getattr(serving, nutrient) * factor
+                for nutrient in NUTRIENTS}
+
+    def nutrients_many(self, amounts) -> list[dict]:
+        """
+        Returns the nutrients of each of the given amounts, like "150 g" or (150, "g").
+        """
+        return [self.nutrients(amount) if isinstance(amount, str) else self.nutrients(*amount)
+                for amount in amounts]
+
+
+def convert_many(items) -> list[dict]:
+    """
+    Computes the nutrients of many (food, amount) or (food, quantity, unit) items. The
+    conversion table of each food is built once.
+
+    Parameters:
+        items (Iterable[tuple]): Foods as accepted by `ServingConverter` with their amounts.
+
+    Returns:
+        list[dict]: The nutrients of each item, in the same order.
+    """
+    converters = {}
+    results = []
+    for food, *amount in items:
+        if id(food) not in converters:
+            # The food is kept so that its id isn't reused by another object.
+            converters[id(food)] = (ServingConverter(food), food)
+        results.append(converters[id(food)][0].nutrients(*amount))
+    return results
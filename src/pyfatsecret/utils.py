@@ -0,0 +1,50 @@
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def as_list(value) -> list:
+    """
+    Returns `value` as a list. The API returns a single element of a list as the element
+    itself, e.g. a food with one serving has a `serving` dict instead of a list.
+
+    Parameters:
+        value: A list, a single element or None.
+
+    Returns:
+        list: `value` if it is a list, [] for None, otherwise [value].
+    """
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+@contextlib.contextmanager
+def file_lock(lock_path: str):
+    """
+    Holds an exclusive advisory lock on `lock_path`, shared between processes. The file is
+    created if needed and only readable by its owner.
+
+    Parameters:
+        lock_path (str): Path of the lock file.
+    """
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)